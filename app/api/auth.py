@@ -1,7 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from starlette.responses import Response
 
-from app.api.dependencies import DBDep, UserIdDep
+from app.api.dependencies import DBDep, ReadDBDep, UserIdDep, admission
 from app.exceptions.auth import (
     UserAlreadyExistsError,
     UserAlreadyExistsHTTPError,
@@ -9,6 +9,8 @@ from app.exceptions.auth import (
     UserNotFoundHTTPError,
     InvalidPasswordError,
     InvalidPasswordHTTPError,
+    PasswordHasherOverloadedError,
+    PasswordHasherOverloadedHTTPError,
 )
 from app.schemes.users import SUserAddRequest, SUserAuth
 from app.schemes.relations_users_roles import SUserGetWithRels
@@ -17,7 +19,11 @@ from app.services.auth import AuthService
 router = APIRouter(prefix="/auth", tags=["Авторизация и аутентификация"])
 
 
-@router.post("/register", summary="Регистрация нового пользователя")
+@router.post(
+    "/register",
+    summary="Регистрация нового пользователя",
+    dependencies=[Depends(admission("register", "auth"))],
+)
 async def register_user(
     db: DBDep,
     user_data: SUserAddRequest,
@@ -26,10 +32,16 @@ async def register_user(
         await AuthService(db).register_user(user_data)
     except UserAlreadyExistsError:
         raise UserAlreadyExistsHTTPError
+    except PasswordHasherOverloadedError:
+        raise PasswordHasherOverloadedHTTPError
     return {"status": "OK"}
 
 
-@router.post("/login", summary="Аутентификация пользователя")
+@router.post(
+    "/login",
+    summary="Аутентификация пользователя",
+    dependencies=[Depends(admission("login", "auth"))],
+)
 async def login_user(
     db: DBDep,
     response: Response,
@@ -41,12 +53,14 @@ async def login_user(
         raise UserNotFoundHTTPError
     except InvalidPasswordError:
         raise InvalidPasswordHTTPError
+    except PasswordHasherOverloadedError:
+        raise PasswordHasherOverloadedHTTPError
     response.set_cookie("access_token", access_token)
     return {"access_token": access_token}
 
 
 @router.get("/me", summary="Получение текущего пользователя для профиля")
-async def get_me(db: DBDep, user_id: UserIdDep) -> SUserGetWithRels | None:
+async def get_me(db: ReadDBDep, user_id: UserIdDep) -> SUserGetWithRels | None:
     try:
         user: None | SUserGetWithRels = await AuthService(db).get_me(user_id)
     except UserNotFoundError:
@@ -1,32 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import List
-from app.api.dependencies import DBDep
-from app.models.categories import CategoriesModel
+from app.api.dependencies import DBDep, ReadDBDep
 from app.schemes.categories import SCategoriesAdd, SCategoriesUpdate, SCategoriesGet
+from app.services.categories import CategoriesService
+from app.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_validators,
+)
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
 
 @router.get("/", response_model=List[SCategoriesGet])
-async def get_categories(db: DBDep, skip: int = 0, limit: int = 100, ):
+async def get_categories(
+    db: ReadDBDep,
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+):
     """Получить все категории"""
-    return db.query(CategoriesModel).offset(skip).limit(limit).all()
+    count, max_id, last_modified = await CategoriesService(db).get_categories_version()
+    etag = make_etag("categories", request.url.query, count, max_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_cache_validators(response, etag, last_modified)
+    categories = await CategoriesService(db).get_categories(offset=skip, limit=limit)
+    return json_list_response(SCategoriesGet, categories, response)
 
 @router.get("/{category_id}", response_model=SCategoriesGet)
-async def get_category(db: DBDep,category_id: int):
+async def get_category(
+    db: ReadDBDep, request: Request, response: Response, category_id: int
+):
     """Получить категорию по ID"""
-    category = db.query(CategoriesModel).filter(CategoriesModel.id == category_id).first()
+    count, _, last_modified = await CategoriesService(db).get_category_version(
+        category_id=category_id
+    )
+    if not count:
+        raise HTTPException(status_code=404, detail="Категория не найдена")
+    etag = make_etag("category", category_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_cache_validators(response, etag, last_modified)
+
+    category = await CategoriesService(db).get_category(category_id=category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Категория не найдена")
     return category
 
-@router.post("/", response_model=SCategoriesGet, status_code=201)
 @router.post("/", response_model=SCategoriesGet, status_code=201)
 async def create_category(db: DBDep, category_data: SCategoriesAdd):
     """Создать новую категорию"""
-    category = CategoriesModel(**category_data.dict())
-    db.add(category)
-    db.commit()
-    db.refresh(category)
+    category = await CategoriesService(db).create_category(category_data)
     return category
 
 @router.put("/{category_id}", response_model=SCategoriesGet)
@@ -36,24 +64,17 @@ async def update_category(
     category_data: SCategoriesUpdate, 
 ):
     """Обновить категорию"""
-    category = db.query(CategoriesModel).filter(CategoriesModel.id == category_id).first()
+    category = await CategoriesService(db).update_category(
+        category_id=category_id, category_data=category_data
+    )
     if not category:
         raise HTTPException(status_code=404, detail="Категория не найдена")
-    
-    for key, value in category_data.dict(exclude_unset=True).items():
-        setattr(category, key, value)
-    
-    db.commit()
-    db.refresh(category)
     return category
 
 @router.delete("/{category_id}")
 async def delete_category(db: DBDep, category_id: int):
     """Удалить категорию"""
-    category = db.query(CategoriesModel).filter(CategoriesModel.id == category_id).first()
+    category = await CategoriesService(db).delete_category(category_id=category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Категория не найдена")
-    
-    db.delete(category)
-    db.commit()
-    return {"message": "Категория успешно удалена"}
\ No newline at end of file
+    return {"message": "Категория успешно удалена"}
@@ -3,14 +3,24 @@ from typing import Annotated
 from fastapi import Depends, Request
 from pydantic import BaseModel, Field
 
-from app.database.database import async_session_maker
+from app.database.database import async_read_session_maker, async_session_maker
 from app.exceptions.auth import (
     InvalidJWTTokenError,
     InvalidTokenHTTPError,
+    JWTTokenExpiredError,
+    JWTTokenExpiredHTTPError,
     NoAccessTokenHTTPError,
     IsNotAdminHTTPError,
 )
-from app.services.auth import AuthService
+from app.exceptions.rate_limit import (
+    AdmissionRejectedError,
+    AdmissionRejectedHTTPError,
+    RateLimitExceededError,
+    RateLimitExceededHTTPError,
+)
+from app.config import settings
+from app.services.rate_limiter import rate_limiter
+from app.services.principals import principal_cache
 from app.database.db_manager import DBManager
 
 
@@ -29,12 +39,20 @@ def get_token(request: Request) -> str:
     return token
 
 
-def get_current_user_id(token: str = Depends(get_token)) -> int:
+def get_token_payload(token: str = Depends(get_token)) -> dict:
     try:
-        data = AuthService.decode_token(token)
+        return principal_cache.decode_token(token)
     except InvalidJWTTokenError:
         raise InvalidTokenHTTPError
-    return data["user_id"]
+    except JWTTokenExpiredError:
+        raise JWTTokenExpiredHTTPError
+
+
+TokenPayloadDep = Annotated[dict, Depends(get_token_payload)]
+
+
+def get_current_user_id(payload: TokenPayloadDep) -> int:
+    return payload["user_id"]
 
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
@@ -47,12 +65,68 @@ async def get_db():
 
 DBDep = Annotated[DBManager, Depends(get_db)]
 
-async def check_is_admin(db: DBDep, user_id:UserIdDep):
-    user = await db.users.get_one_or_none_with_role(id=user_id)
 
-    if user.role.name == "admin":
+async def get_read_db():
+    async with DBManager(session_factory=async_read_session_maker) as db:
+        yield db
+
+
+# Для GET-ручек: сессии только для чтения из отдельного пула (см. app/database/database.py)
+ReadDBDep = Annotated[DBManager, Depends(get_read_db)]
+
+async def check_is_admin(payload: TokenPayloadDep):
+    role_name = await principal_cache.get_role_name(payload)
+
+    if role_name == "admin":
         return True
     else:
         raise IsNotAdminHTTPError
     
-IsAdminDep = Annotated[int, Depends(check_is_admin)]
\ No newline at end of file
+IsAdminDep = Annotated[int, Depends(check_is_admin)]
+
+
+def client_address(request: Request) -> str:
+    """
+    Адрес клиента для лимитов. За доверенными прокси (RATE_LIMIT_TRUSTED_PROXIES)
+    X-Forwarded-For читается справа налево до первого недоверенного адреса:
+    левые значения клиент может подставить сам
+    """
+    address = request.client.host if request.client else "unknown"
+    trusted = settings.RATE_LIMIT_TRUSTED_PROXIES
+    if address not in trusted:
+        return address
+    forwarded = request.headers.get("x-forwarded-for", "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        address = hop
+        if hop not in trusted:
+            break
+    return address
+
+
+def admission(route: str, gate: str):
+    """
+    Зависимость ручки под защитой rate_limiter: корзины жетонов route (429),
+    затем место в классе gate (503), которое держится до конца обработки.
+    Подключается через dependencies=[Depends(admission(...))]
+    """
+    route_limit = rate_limiter.routes[route]
+    admission_gate = rate_limiter.gates[gate]
+
+    async def dependency(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            yield
+            return
+        try:
+            route_limit.check(client_address(request))
+        except RateLimitExceededError as exc:
+            raise RateLimitExceededHTTPError(exc.retry_after)
+        try:
+            await admission_gate.acquire()
+        except AdmissionRejectedError as exc:
+            raise AdmissionRejectedHTTPError(exc.retry_after)
+        try:
+            yield
+        finally:
+            admission_gate.release()
+
+    return dependency
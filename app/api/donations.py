@@ -1,48 +1,168 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.api.dependencies import DBDep
+from typing import List, Literal, Optional
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep, admission
+from app.database.database import async_read_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.donations import (
+    DonationIntakeOverloadedError,
+    DonationIntakeOverloadedHTTPError,
+    InvalidExportPeriodError,
+    InvalidExportPeriodHTTPError,
+)
+from app.exceptions.fields import InvalidFieldsError, InvalidFieldsHTTPError
+from app.exceptions.pagination import (
+    InvalidCursorError,
+    InvalidCursorHTTPError,
+    InvalidSortKeyError,
+    InvalidSortKeyHTTPError,
+)
 from app.models.donations import DonationModel
 from app.schemes.donations import SDonationAdd, SDonationUpdate, SDonationGet
+from app.schemes.bulk import SBulkImportReport
+from app.services.bulk_import import BulkImportService
+from app.services.donation_intake import donation_intake
+from app.services.donations import DonationsService
+from app.utils.bulk import iter_records, resolve_format
+from app.utils.conditional import accepts_gzip
+from app.utils.fields import parse_fields, partial_schema
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/api/donations", tags=["donations"])
 
 @router.get("/", response_model=List[SDonationGet])
 async def get_donations(
-    db: DBDep,
+    db: ReadDBDep,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     user_id: Optional[int] = None,
     project_id: Optional[int] = None,
-    
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    desc: bool = False,
+    fields: Optional[str] = None,
 ):
-    """Получить все пожертвования с фильтрацией"""
-    query = db.query(DonationModel)
-    
-    if user_id:
-        query = query.filter(DonationModel.user_id == user_id)
-    if project_id:
-        query = query.filter(DonationModel.project_id == project_id)
-    
-    return query.offset(skip).limit(limit).all()
+    """Получить все пожертвования с фильтрацией.
+    fields=id,amount,... - вернуть только перечисленные поля.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor"""
+    try:
+        fields = parse_fields(SDonationGet, fields)
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
+    schema = SDonationGet if fields is None else partial_schema(SDonationGet, fields)
+    if cursor is None and skip:
+        donations = await DonationsService(db).get_filtered_donations(
+            offset=skip, limit=limit, user_id=user_id, project_id=project_id, fields=fields
+        )
+        return json_list_response(schema, donations, response)
+
+    try:
+        donations, next_cursor = await DonationsService(db).get_donations_page(
+            limit=limit,
+            cursor=cursor,
+            sort_key=sort,
+            descending=desc,
+            user_id=user_id,
+            project_id=project_id,
+            fields=fields,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    except InvalidSortKeyError:
+        raise InvalidSortKeyHTTPError
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_list_response(schema, donations, response)
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
 
-@router.get("/{donation_id}", response_model=SDonationGet)
-async def get_donation(db: DBDep,donation_id: int):
-    """Получить пожертвование по ID"""
-    donation = db.query(DonationModel).filter(DonationModel.id == donation_id).first()
+
+@router.get("/export")
+async def export_donations(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    project_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Потоковая выгрузка пожертвований в NDJSON или CSV.
+    Период полуоткрытый: date_from <= created_at < date_to"""
+    try:
+        date_from, date_to = DonationsService.check_export_period(date_from, date_to)
+    except InvalidExportPeriodError:
+        raise InvalidExportPeriodHTTPError
+    compress = accepts_gzip(request)
+
+    async def stream():
+        # Своя сессия чтения живёт, пока отдаётся ответ; запись не блокируется
+        async with DBManager(session_factory=async_read_session_maker) as db:
+            async for chunk in DonationsService(db).export_donations(
+                format=format,
+                compress=compress,
+                project_id=project_id,
+                user_id=user_id,
+                date_from=date_from,
+                date_to=date_to,
+            ):
+                yield chunk
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="donations.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(stream(), media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
+@router.get("/{donation_id}")
+async def get_donation(db: ReadDBDep, donation_id: int, fields: Optional[str] = None):
+    """Получить пожертвование по ID. fields=id,amount,... - вернуть только перечисленные поля"""
+    try:
+        fields = parse_fields(SDonationGet, fields)
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
+    donation = await DonationsService(db).get_donation(donation_id=donation_id, fields=fields)
     if not donation:
         raise HTTPException(status_code=404, detail="Пожертвование не найдено")
     return donation
 
-@router.post("/", response_model=SDonationGet, status_code=201)
+@router.post(
+    "/",
+    response_model=SDonationGet,
+    status_code=201,
+    dependencies=[Depends(admission("donations", "donations"))],
+)
 async def create_donation(db: DBDep, donation_data: SDonationAdd):
     """Создать новое пожертвование"""
-    donation = DonationModel(**donation_data.dict())
-    db.add(donation)
-    db.commit()
-    db.refresh(donation)
+    if donation_intake.is_running:
+        try:
+            return await donation_intake.submit(donation_data)
+        except DonationIntakeOverloadedError:
+            raise DonationIntakeOverloadedHTTPError
+    donation = await DonationsService(db).create_donation(donation_data)
     return donation
 
+@router.post("/bulk", response_model=SBulkImportReport)
+async def import_donations(
+    db: DBDep,
+    request: Request,
+    is_admin: IsAdminDep,
+    format: Optional[Literal["ndjson", "csv"]] = None,
+):
+    """Массовая загрузка пожертвований из NDJSON или CSV (формат - параметр format или Content-Type).
+    Ошибочные строки пропускаются и перечисляются в отчёте"""
+    records = iter_records(
+        request.stream(), resolve_format(request.headers.get("content-type"), format)
+    )
+    return await BulkImportService(db).import_records("donations", records)
+
+
 @router.put("/{donation_id}", response_model=SDonationGet)
 async def update_donation(
     db: DBDep,
@@ -51,24 +171,17 @@ async def update_donation(
  
 ):
     """Обновить пожертвование"""
-    donation = db.query(DonationModel).filter(DonationModel.id == donation_id).first()
+    donation = await DonationsService(db).update_donation(
+        donation_id=donation_id, donation_data=donation_data
+    )
     if not donation:
         raise HTTPException(status_code=404, detail="Пожертвование не найдено")
-    
-    for key, value in donation_data.dict(exclude_unset=True).items():
-        setattr(donation, key, value)
-    
-    db.commit()
-    db.refresh(donation)
     return donation
 
 @router.delete("/{donation_id}")
 async def delete_donation(db: DBDep,donation_id: int):
     """Удалить пожертвование"""
-    donation = db.query(DonationModel).filter(DonationModel.id == donation_id).first()
+    donation = await DonationsService(db).delete_donation(donation_id=donation_id)
     if not donation:
         raise HTTPException(status_code=404, detail="Пожертвование не найдено")
-    
-    db.delete(donation)
-    db.commit()
     return {"message": "Пожертвование успешно удалено"}
\ No newline at end of file
@@ -1,36 +1,194 @@
-from fastapi import APIRouter, HTTPException
-from typing import  Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import  Literal, Optional
 
 
-from app.api.dependencies import DBDep
-from app.schemes.projects import SProjectAdd, SProjectUpdate, SProjectGet
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep
+from app.exceptions.fields import (
+    InvalidFieldsError,
+    InvalidFieldsHTTPError,
+    InvalidIncludeError,
+    InvalidIncludeHTTPError,
+)
+from app.exceptions.pagination import (
+    InvalidCursorError,
+    InvalidCursorHTTPError,
+    InvalidSortKeyError,
+    InvalidSortKeyHTTPError,
+)
+from app.exceptions.search import InvalidSearchQueryError, InvalidSearchQueryHTTPError
+from app.schemes.projects import (
+    SProjectAdd,
+    SProjectUpdate,
+    SProjectGet,
+    SProjectSearchResult,
+    SProjectStatsGet,
+    SProjectsWithRelations,
+)
+from app.schemes.bulk import SBulkImportReport
+from app.services.bulk_import import BulkImportService
+from app.utils.bulk import iter_records, resolve_format
+from app.services.deadline_sweeper import deadline_sweeper
 from app.services.projects import ProjectsService
+from app.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_validators,
+)
+from app.utils.fields import (
+    parse_fields,
+    parse_include,
+    partial_schema,
+    relations_schema,
+)
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
 @router.get("/", response_model=list[SProjectGet])
 async def get_projects(
-    db: DBDep,
+    db: ReadDBDep,
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
     user_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    desc: bool = False,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
 ):
-    """Получить все проекты с фильтрацией"""
-    
-    projects = await ProjectsService(db).get_filtered_projects(offset=skip, limit=limit,user_id=user_id, category_id=category_id)
-   
-    return projects
+    """Получить все проекты с фильтрацией.
+    fields=id,title,... - вернуть только перечисленные поля.
+    include=creator,category,donations,rewards - добавить связи (без ETag:
+    версия проектов не отражает изменений в связанных таблицах).
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor"""
+    try:
+        fields = parse_fields(SProjectGet, fields)
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
+    try:
+        include = parse_include(SProjectsWithRelations, include)
+    except InvalidIncludeError:
+        raise InvalidIncludeHTTPError
+    schema = SProjectGet if fields is None else partial_schema(SProjectGet, fields)
+    # Внешние ключи связей читаются, но в ответ попадают только запрошенные поля
+    load_fields = ProjectsService.fields_for_include(fields, include)
+    if include:
+        schema = relations_schema(schema, SProjectsWithRelations, include)
+    else:
+        count, max_id, last_modified = await ProjectsService(db).get_projects_version(
+            user_id=user_id, category_id=category_id
+        )
+        etag = make_etag("projects", request.url.query, count, max_id, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        set_cache_validators(response, etag, last_modified)
+
+    if cursor is None and skip:
+        projects = await ProjectsService(db).get_filtered_projects(offset=skip, limit=limit,user_id=user_id, category_id=category_id, fields=load_fields)
+        projects = await ProjectsService(db).include_relations(projects, include, schema)
+        return json_list_response(schema, projects, response)
+
+    try:
+        projects, next_cursor = await ProjectsService(db).get_projects_page(
+            limit=limit,
+            cursor=cursor,
+            sort_key=sort,
+            descending=desc,
+            user_id=user_id,
+            category_id=category_id,
+            fields=load_fields,
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    except InvalidSortKeyError:
+        raise InvalidSortKeyHTTPError
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    projects = await ProjectsService(db).include_relations(projects, include, schema)
+    return json_list_response(schema, projects, response)
+
+@router.get("/search", response_model=list[SProjectSearchResult])
+async def search_projects(
+    db: ReadDBDep,
+    response: Response,
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    category_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+):
+    """Полнотекстовый поиск проектов по названию и описанию.
+    Текст snippet экранирован для HTML, совпадения выделены тегом <mark>.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor"""
+    try:
+        projects, next_cursor = await ProjectsService(db).search_projects(
+            query=q,
+            limit=limit,
+            cursor=cursor,
+            category_id=category_id,
+            is_active=is_active,
+        )
+    except InvalidSearchQueryError:
+        raise InvalidSearchQueryHTTPError
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_list_response(SProjectSearchResult, projects, response)
 
 @router.get("/{project_id}")
-async def get_project(project_id: int, db: DBDep):
-    """Получить проект по ID"""
-    project = await ProjectsService(db).get_project(project_id=project_id)
+async def get_project(
+    project_id: int,
+    db: ReadDBDep,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+):
+    """Получить проект по ID. fields=id,title,... - вернуть только перечисленные поля.
+    include=creator,category,donations,rewards - добавить связи (без ETag)"""
+    try:
+        fields = parse_fields(SProjectGet, fields)
+    except InvalidFieldsError:
+        raise InvalidFieldsHTTPError
+    try:
+        include = parse_include(SProjectsWithRelations, include)
+    except InvalidIncludeError:
+        raise InvalidIncludeHTTPError
+    load_fields = ProjectsService.fields_for_include(fields, include)
+    if not include:
+        count, _, last_modified = await ProjectsService(db).get_project_version(
+            project_id=project_id
+        )
+        if not count:
+            raise HTTPException(status_code=404, detail="Проект не найден")
+        etag = make_etag("project", project_id, fields, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        set_cache_validators(response, etag, last_modified)
+
+    project = await ProjectsService(db).get_project(project_id=project_id, fields=load_fields)
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден")
+    if include:
+        schema = SProjectGet if fields is None else partial_schema(SProjectGet, fields)
+        schema = relations_schema(schema, SProjectsWithRelations, include)
+        [project] = await ProjectsService(db).include_relations([project], include, schema)
     return project
 
+@router.get("/{project_id}/stats", response_model=SProjectStatsGet)
+async def get_project_stats(project_id: int, db: ReadDBDep):
+    """Получить агрегаты пожертвований проекта"""
+    stats = await ProjectsService(db).get_project_stats(project_id=project_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="Проект не найден")
+    return stats
+
 @router.post("/", response_model=SProjectGet, status_code=201)
 async def create_project(project_data: SProjectAdd, db: DBDep):
     """Создать новый проект"""
@@ -39,6 +197,21 @@ async def create_project(project_data: SProjectAdd, db: DBDep):
 
 
 
+@router.post("/bulk", response_model=SBulkImportReport)
+async def import_projects(
+    db: DBDep,
+    request: Request,
+    is_admin: IsAdminDep,
+    format: Optional[Literal["ndjson", "csv"]] = None,
+):
+    """Массовая загрузка проектов из NDJSON или CSV (формат - параметр format или Content-Type).
+    Ошибочные строки пропускаются и перечисляются в отчёте"""
+    records = iter_records(
+        request.stream(), resolve_format(request.headers.get("content-type"), format)
+    )
+    return await BulkImportService(db).import_records("projects", records)
+
+
 @router.put("/{project_id}", response_model=None)
 async def update_project(
     project_id: int,
@@ -51,7 +224,10 @@ async def update_project(
         raise HTTPException(status_code=404, detail="Проект не найден")
     
     await db.projects.edit(project_data, id=project_id)
+    await db.commit()
     updated_project = await db.projects.get_one_or_none(id=project_id)
+    if project_data.date_end is not None:
+        deadline_sweeper.schedule(project_data.date_end)
     return updated_project
 
 @router.delete("/{project_id}")
@@ -62,4 +238,5 @@ async def delete_project(project_id: int, db: DBDep):
         raise HTTPException(status_code=404, detail="Проект не найден")
     
     await db.projects.delete(id=project_id)
+    await db.commit()
     return {"message": "Проект успешно удален"}
\ No newline at end of file
@@ -1,32 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from typing import List, Optional
-from app.api.dependencies import DBDep
-from app.models.rewards import RewardModel
+from typing import List, Literal, Optional
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep
+from app.exceptions.pagination import InvalidCursorError, InvalidCursorHTTPError
 from app.schemes.rewards import SRewardAdd, SRewardUpdate, SRewardGet
+from app.schemes.bulk import SBulkImportReport
+from app.services.bulk_import import BulkImportService
 from app.services.rewards import RewardsService
+from app.utils.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_validators,
+)
+from app.utils.bulk import iter_records, resolve_format
+from app.utils.pagination import MAX_PAGE_LIMIT
+from app.utils.serialization import json_list_response
 
 router = APIRouter(prefix="/api/rewards", tags=["rewards"])
 
 @router.get("/", response_model=List[SRewardGet])
 async def get_rewards(
-    db: DBDep,
+    db: ReadDBDep,
+    request: Request,
+    response: Response,
     skip: int = 0, 
-    limit: int = 100, 
-    
-   
+    limit: int = Query(100, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = None,
 ):
-    """Получить все награды с фильтрацией"""
-    rewards = await RewardsService(db).get_filtered_rewards(offset=skip, limit=limit)
-   
-    return rewards
+    """Получить все награды с фильтрацией.
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor"""
+    count, max_id, last_modified = await RewardsService(db).get_rewards_version()
+    etag = make_etag("rewards", request.url.query, count, max_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_cache_validators(response, etag, last_modified)
+
+    if cursor is None and skip:
+        rewards = await RewardsService(db).get_filtered_rewards(offset=skip, limit=limit)
+        return json_list_response(SRewardGet, rewards, response)
+
+    try:
+        rewards, next_cursor = await RewardsService(db).get_rewards_page(
+            limit=limit, cursor=cursor
+        )
+    except InvalidCursorError:
+        raise InvalidCursorHTTPError
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return json_list_response(SRewardGet, rewards, response)
 
 @router.get("/{reward_id}", response_model=SRewardGet)
-async def get_reward(db: DBDep, reward_id: int):
+async def get_reward(
+    db: ReadDBDep, request: Request, response: Response, reward_id: int
+):
     """Получить награду по ID"""
-    reward = db.query(RewardModel).filter(RewardModel.id == reward_id).first()
+    count, _, last_modified = await RewardsService(db).get_reward_version(
+        reward_id=reward_id
+    )
+    if not count:
+        raise HTTPException(status_code=404, detail="Награда не найдена")
+    etag = make_etag("reward", reward_id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    reward = await RewardsService(db).get_reward(reward_id=reward_id)
     if not reward:
         raise HTTPException(status_code=404, detail="Награда не найдена")
+    set_cache_validators(response, etag, last_modified)
     return reward
 
 @router.post("/", response_model=SRewardGet, status_code=201)
@@ -36,6 +77,21 @@ async def create_reward(db: DBDep,reward_data: SRewardAdd):
    
     return reward
 
+@router.post("/bulk", response_model=SBulkImportReport)
+async def import_rewards(
+    db: DBDep,
+    request: Request,
+    is_admin: IsAdminDep,
+    format: Optional[Literal["ndjson", "csv"]] = None,
+):
+    """Массовая загрузка наград из NDJSON или CSV (формат - параметр format или Content-Type).
+    Ошибочные строки пропускаются и перечисляются в отчёте"""
+    records = iter_records(
+        request.stream(), resolve_format(request.headers.get("content-type"), format)
+    )
+    return await BulkImportService(db).import_records("rewards", records)
+
+
 @router.put("/{reward_id}", response_model=SRewardGet)
 async def update_reward(
     db: DBDep,
@@ -44,24 +100,17 @@ async def update_reward(
  
 ):
     """Обновить награду"""
-    reward = db.query(RewardModel).filter(RewardModel.id == reward_id).first()
+    reward = await RewardsService(db).update_reward(
+        reward_id=reward_id, reward_data=reward_data
+    )
     if not reward:
         raise HTTPException(status_code=404, detail="Награда не найдена")
-    
-    for key, value in reward_data.dict(exclude_unset=True).items():
-        setattr(reward, key, value)
-    
-    db.commit()
-    db.refresh(reward)
     return reward
 
 @router.delete("/{reward_id}")
 async def delete_reward(db: DBDep, reward_id: int):
     """Удалить награду"""
-    reward = db.query(RewardModel).filter(RewardModel.id == reward_id).first()
+    reward = await RewardsService(db).delete_reward(reward_id=reward_id)
     if not reward:
         raise HTTPException(status_code=404, detail="Награда не найдена")
-    
-    db.delete(reward)
-    db.commit()
-    return {"message": "Награда успешно удалена"}
\ No newline at end of file
+    return {"message": "Награда успешно удалена"}
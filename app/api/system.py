@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import IsAdminDep
+from app.database.slow_queries import slow_query_log
+from app.services.deadline_sweeper import deadline_sweeper
+from app.services.donation_intake import donation_intake
+from app.services.passwords import password_hasher
+from app.services.principals import principal_cache
+from app.services.rate_limiter import rate_limiter
+from app.utils.cache import query_cache
+
+router = APIRouter(prefix="/api/system", tags=["system"])
+
+
+@router.get("/donation-intake", summary="Состояние очереди групповой записи пожертвований")
+async def get_donation_intake_stats(is_admin: IsAdminDep) -> dict:
+    return donation_intake.stats()
+
+
+@router.get("/deadline-sweeper", summary="Состояние фонового закрытия проектов по date_end")
+async def get_deadline_sweeper_stats(is_admin: IsAdminDep) -> dict:
+    return deadline_sweeper.stats()
+
+
+@router.get("/rate-limits", summary="Лимиты запросов и очереди допуска к ручкам")
+async def get_rate_limiter_stats(is_admin: IsAdminDep) -> dict:
+    return rate_limiter.stats()
+
+
+@router.get("/cache", summary="Статистика кэша результатов чтения")
+async def get_query_cache_stats(is_admin: IsAdminDep) -> dict:
+    return query_cache.stats()
+
+
+@router.get("/principals", summary="Статистика кэша токенов и ролей")
+async def get_principal_cache_stats(is_admin: IsAdminDep) -> dict:
+    return principal_cache.stats()
+
+
+@router.get("/password-hasher", summary="Состояние пула хэширования паролей")
+async def get_password_hasher_stats(is_admin: IsAdminDep) -> dict:
+    return password_hasher.stats()
+
+
+@router.get("/slow-queries", summary="Медленные запросы: шаблоны с наибольшим суммарным временем")
+async def get_slow_queries(
+    is_admin: IsAdminDep, limit: int = Query(20, ge=1, le=200)
+) -> dict:
+    return slow_query_log.stats(limit)
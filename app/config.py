@@ -6,6 +6,114 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     DB_NAME: str
+
+    # Профиль подключения SQLite, применяется к каждому новому соединению
+    DB_JOURNAL_MODE: str = "WAL"
+    DB_SYNCHRONOUS: str = "NORMAL"
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Отрицательное значение - размер кэша в КиБ
+    DB_CACHE_SIZE: int = -64 * 1024
+    DB_TEMP_STORE: str = "MEMORY"
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    # SQLite допускает одного писателя, поэтому пул записи из одного соединения
+    DB_WRITE_POOL_SIZE: int = 1
+    DB_READ_POOL_SIZE: int = 5
+    # Файл-реплика для чтения (ReadDBDep); по умолчанию читаем основную БД
+    DB_READ_NAME: str | None = None
+    # SQLITE_MAX_VARIABLE_NUMBER для SQLite >= 3.32 (у SQLAlchemy потолок 32700)
+    DB_MAX_VARIABLES: int = 32700
+
+    # Кэш результатов чтения репозиториев (см. app/utils/cache.py)
+    QUERY_CACHE_ENABLED: bool = False
+    QUERY_CACHE_MAXSIZE: int = 2048
+    QUERY_CACHE_TTL: float = 30.0
+
+    # Групповая запись пожертвований (см. app/services/donation_intake.py)
+    DONATION_INTAKE_ENABLED: bool = False
+    DONATION_INTAKE_BATCH_SIZE: int = 100
+    DONATION_INTAKE_MAX_DELAY_MS: int = 10
+    DONATION_INTAKE_MAX_QUEUE: int = 10000
+
+    # Кэш токенов и пользователей с ролями (см. app/services/principals.py)
+    # Сброс кэша при смене ролей виден только в своём процессе: другие воркеры
+    # видят его через PRINCIPAL_CACHE_TTL, а роль из токена - после его истечения
+    PRINCIPAL_CACHE_TTL: float = 60.0
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
+
+    # Хэширование паролей (см. app/services/passwords.py)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Сколько последних пожертвований и наград проекта отдаёт include=
+    PROJECT_INCLUDE_DONATIONS_LIMIT: int = 10
+    PROJECT_INCLUDE_REWARDS_LIMIT: int = 10
+
+    # Закрытие проектов по date_end (см. app/services/deadline_sweeper.py)
+    DEADLINE_SWEEPER_ENABLED: bool = True
+    DEADLINE_SWEEPER_BATCH_SIZE: int = 500
+    # Сколько ближайших дедлайнов держать в памяти
+    DEADLINE_SWEEPER_HEAP_SIZE: int = 1000
+    # Не спать дольше: дедлайны проектов из других воркеров видны после перечитывания
+    DEADLINE_SWEEPER_MAX_SLEEP: float = 60.0
+    DEADLINE_SWEEPER_LEASE_TTL: int = 30
+
+    # Возвраты неуспешных проектов (см. app/jobs/refund_failed_projects.py)
+    REFUND_CHUNK_SIZE: int = 500
+    # Пауза после пачки = время её транзакции * ratio (1.0 - писатель занят не больше половины времени)
+    REFUND_THROTTLE_RATIO: float = 1.0
+    REFUND_MIN_PAUSE_MS: int = 10
+
+    # Лимиты запросов и допуск к ручкам входа, регистрации и пожертвований (см. app/services/rate_limiter.py)
+    RATE_LIMIT_ENABLED: bool = True
+    # Клиент - адрес соединения. Если соединение пришло с одного из этих адресов
+    # (reverse proxy), клиентом считается последний недоверенный адрес X-Forwarded-For.
+    # Без этого за прокси все пользователи делят одну корзину
+    RATE_LIMIT_TRUSTED_PROXIES: list[str] = []
+    # Слотов в таблице корзин клиентов одной ручки
+    RATE_LIMIT_CLIENT_SLOTS: int = 65536
+    # *_RATE - жетонов в секунду, *_BURST - ёмкость корзины
+    RATE_LIMIT_LOGIN_CLIENT_RATE: float = 0.2
+    RATE_LIMIT_LOGIN_CLIENT_BURST: int = 10
+    RATE_LIMIT_LOGIN_ROUTE_RATE: float = 20.0
+    RATE_LIMIT_LOGIN_ROUTE_BURST: int = 40
+    RATE_LIMIT_REGISTER_CLIENT_RATE: float = 0.05
+    RATE_LIMIT_REGISTER_CLIENT_BURST: int = 5
+    RATE_LIMIT_REGISTER_ROUTE_RATE: float = 10.0
+    RATE_LIMIT_REGISTER_ROUTE_BURST: int = 20
+    RATE_LIMIT_DONATIONS_CLIENT_RATE: float = 2.0
+    RATE_LIMIT_DONATIONS_CLIENT_BURST: int = 20
+    RATE_LIMIT_DONATIONS_ROUTE_RATE: float = 500.0
+    RATE_LIMIT_DONATIONS_ROUTE_BURST: int = 1000
+    # Одновременных запросов класса, сверх них - очередь с таймаутом, дальше 503
+    ADMISSION_AUTH_CONCURRENCY: int = 8
+    ADMISSION_AUTH_MAX_QUEUE: int = 32
+    ADMISSION_AUTH_QUEUE_TIMEOUT_MS: int = 1000
+    ADMISSION_DONATIONS_CONCURRENCY: int = 32
+    ADMISSION_DONATIONS_MAX_QUEUE: int = 256
+    ADMISSION_DONATIONS_QUEUE_TIMEOUT_MS: int = 2000
+    # Retry-After ответа 503, секунд
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # Строк в одной пачке потоковой выгрузки /api/donations/export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Массовая загрузка (см. app/services/bulk_import.py)
+    BULK_IMPORT_BATCH_SIZE: int = 5000
+    BULK_IMPORT_MAX_ERRORS: int = 1000
+
+    # Метрики запросов и SQL на /api/metrics (см. app/middleware/metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # Журнал медленных запросов (см. app/database/slow_queries.py)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_LOG_PATH: str = "logs/slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+    # Шаблонов запросов в сводке /api/system/slow-queries
+    SLOW_QUERY_MAX_STATEMENTS: int = 1000
+
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
     )
@@ -18,6 +126,10 @@ class Settings(BaseSettings):
     def get_db_url(self):
         return f"sqlite+aiosqlite:///{self.DB_NAME}"
 
+    @property
+    def get_read_db_url(self):
+        return f"sqlite+aiosqlite:///{self.DB_READ_NAME or self.DB_NAME}"
+
     @property
     def auth_data(self):
         return {"secret_key": self.SECRET_KEY, "algorithm": self.ALGORITHM}
@@ -1,28 +1,91 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import NullPool, func, text
+from sqlalchemy import NullPool, event, func, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.database.metrics import InstrumentedQueuePool, instrument_engine
 
-engine = create_async_engine(settings.get_db_url)
+
+def apply_sqlite_profile(engine: AsyncEngine, read_only: bool = False) -> None:
+    """Настраивает PRAGMA SQLite для каждого нового соединения движка"""
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Режим журнала хранится в самом файле БД, менять его может только писатель
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={settings.DB_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.DB_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={settings.DB_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={settings.DB_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA temp_store={settings.DB_TEMP_STORE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}")
+        if read_only:
+            # Любая запись через соединение чтения - ошибка SQLite, а не тихий коммит
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+
+# Пул с замером ожидания соединения для /api/metrics (см. app/database/metrics.py)
+pool_class = InstrumentedQueuePool if settings.METRICS_ENABLED else AsyncAdaptedQueuePool
+
+# Движок записи: все изменения идут через единственное соединение
+engine = create_async_engine(
+    settings.get_db_url,
+    poolclass=pool_class,
+    pool_size=settings.DB_WRITE_POOL_SIZE,
+    max_overflow=0,
+    pool_logging_name="write",
+)
+apply_sqlite_profile(engine)
+
+# Движок чтения: отдельный пул (и, если задан DB_READ_NAME, отдельный файл),
+# читатели не ждут в очереди за писателем. AUTOCOMMIT - без BEGIN/ROLLBACK:
+# каждый SELECT видит свой снимок WAL, транзакция чтения не держится между запросами
+read_engine = create_async_engine(
+    settings.get_read_db_url,
+    isolation_level="AUTOCOMMIT",
+    poolclass=pool_class,
+    pool_size=settings.DB_READ_POOL_SIZE,
+    max_overflow=0,
+    pool_logging_name="read",
+)
+apply_sqlite_profile(read_engine, read_only=True)
 
 engine_null_pool = create_async_engine(settings.get_db_url, poolclass=NullPool)
+apply_sqlite_profile(engine_null_pool)
+
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_LOG_ENABLED:
+    for async_engine in (engine, read_engine, engine_null_pool):
+        instrument_engine(async_engine)
 
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+# Сессии чтения: без autoflush, записи через репозитории запрещены (см. BaseRepository._mark_dirty)
+async_read_session_maker = async_sessionmaker(
+    bind=read_engine, expire_on_commit=False, autoflush=False, info={"read_only": True}
+)
 async_session_maker_null_pool = async_sessionmaker(
     bind=engine_null_pool, expire_on_commit=False
 )
 
 
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Base(DeclarativeBase):
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    # CURRENT_TIMESTAMP в SQLite хранит только секунды: два изменения за одну
+    # секунду дали бы одинаковый updated_at и одинаковый ETag
     updated_at: Mapped[datetime] = mapped_column(
-        server_default=func.now(), onupdate=func.now()
+        server_default=func.now(), onupdate=utc_now
     )
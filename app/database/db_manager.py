@@ -1,26 +1,75 @@
+from functools import cached_property
+
+from app.repositories.categories import CategoriesRepository
+from app.repositories.donations import DonationsRepository
+from app.repositories.leases import LeasesRepository
 from app.repositories.project import ProjectsRepository
+from app.repositories.project_stats import ProjectStatsRepository
+from app.repositories.refunds import RefundCheckpointsRepository, RefundsRepository
 from app.repositories.rewards import RewardsRepository
 from app.repositories.roles import RolesRepository
 from app.repositories.users import UsersRepository
+from app.utils.cache import query_cache
+
+
+# Репозитории DBManager: атрибут -> класс
+REPOSITORIES = {
+    "users": UsersRepository,
+    "roles": RolesRepository,
+    "projects": ProjectsRepository,
+    "rewards": RewardsRepository,
+    "donations": DonationsRepository,
+    "project_stats": ProjectStatsRepository,
+    "categories": CategoriesRepository,
+    "leases": LeasesRepository,
+    "refunds": RefundsRepository,
+    "refund_checkpoints": RefundCheckpointsRepository,
+}
 
 
 class DBManager:
+    """
+    Сессия и репозитории создаются при первом обращении, соединение из пула
+    берётся сессией при первом запросе. Запрос, не дошедший до БД (кэш, отказ
+    в доступе), не создаёт ни сессии, ни транзакции, которую пришлось бы откатывать
+    """
+
     def __init__(self, session_factory):
         self.session_factory = session_factory
 
+    @cached_property
+    def session(self):
+        return self.session_factory()
+
+    def __getattr__(self, name):
+        # Вызывается только для ещё не созданных атрибутов
+        repository_class = REPOSITORIES.get(name)
+        if repository_class is None:
+            raise AttributeError(name)
+        repository = repository_class(self.session)
+        setattr(self, name, repository)
+        return repository
+
     async def __aenter__(self):
-        self.session = self.session_factory()
-        # TODO Добавить сюда созданные репозитории
-        # Пример:
-        self.users = UsersRepository(self.session)
-        self.roles = RolesRepository(self.session)
-        self.projects = ProjectsRepository(self.session)
-        self.rewards = RewardsRepository(self.session)
         return self
 
     async def __aexit__(self, *args):
-        await self.session.rollback()
-        await self.session.close()
+        session = self.__dict__.get("session")
+        if session is None:
+            return
+        session.info.pop("dirty_tables", None)
+        # close() откатывает открытую транзакцию и возвращает соединение в пул;
+        # без транзакции соединения у сессии нет и закрывать нечего
+        if session.in_transaction():
+            await session.close()
 
     async def commit(self):
         await self.session.commit()
+        # Сбрасываем кэш ещё раз: чтения, начатые до коммита, могли закэшировать старые данные
+        for table in self.session.info.pop("dirty_tables", ()):
+            query_cache.invalidate(table)
+
+    async def rollback(self):
+        if self.session.in_transaction():
+            await self.session.rollback()
+        self.session.info.pop("dirty_tables", None)
@@ -0,0 +1,79 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.database.slow_queries import slow_query_log
+from app.utils.metrics import metrics, repository_method, request_metrics
+
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+db_statements = metrics.counter(
+    "db_statements_total", "SQL-запросы по методам репозиториев", ("method",)
+)
+# Только изменённые строки: прочитанные драйвер отдаёт позже, при разборе результата
+db_rows_written = metrics.counter(
+    "db_rows_written_total",
+    "Строки, изменённые INSERT/UPDATE/DELETE, по методам репозиториев",
+    ("method",),
+)
+db_seconds = metrics.counter(
+    "db_seconds_total", "Время выполнения SQL по методам репозиториев", ("method",)
+)
+pool_wait = metrics.histogram(
+    "db_pool_checkout_wait_seconds", "Ожидание соединения из пула", ("pool",), POOL_WAIT_BUCKETS
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который замеряет ожидание свободного соединения (имя пула - pool_logging_name)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_wait.observe(time.perf_counter() - started, (self._orig_logging_name or "default",))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _rows_written(cursor) -> int:
+    # У запросов с результатом (SELECT, RETURNING) rowcount до выборки не определён
+    if cursor.description is not None:
+        return 0
+    return max(cursor.rowcount, 0)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    rows = _rows_written(cursor)
+    method = repository_method.get() or "-"
+    stats = request_metrics.get()
+    if settings.METRICS_ENABLED:
+        db_statements.inc((method,))
+        db_seconds.inc((method,), elapsed)
+        if rows:
+            db_rows_written.inc((method,), rows)
+        if stats is not None:
+            stats.statements += 1
+            stats.rows_written += rows
+            stats.db_time += elapsed
+    if settings.SLOW_QUERY_LOG_ENABLED and elapsed >= slow_query_log.threshold:
+        route = stats.route if stats is not None else "-"
+        slow_query_log.observe(
+            conn, statement, parameters, executemany, elapsed, rows, route, method
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Считает запросы, строки и время SQL движка (см. app/utils/metrics.py) и
+    пишет медленные запросы в журнал (см. app/database/slow_queries.py)
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from app.config import settings
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDERS = re.compile(r"\(\?(?:, \?)+\)")
+_ROWS = re.compile(r"(\(\?(?:\.\.\.)?\))(?:, \1)+")
+_SPACES = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Приводит запрос к шаблону: литералы -> ?, списки IN (?, ?, ...) и строки
+    VALUES сворачиваются, чтобы пачки разного размера давали один шаблон
+    """
+    sql = _SPACES.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDERS.sub("(?...)", sql)
+    return _ROWS.sub(r"\1...", sql)
+
+
+def _shape(parameters) -> str:
+    # Типы параметров с подряд идущими повторами: (int, str×3, NoneType)
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    groups: list[list] = []
+    for value in parameters:
+        name = type(value).__name__
+        if groups and groups[-1][0] == name:
+            groups[-1][1] += 1
+        else:
+            groups.append([name, 1])
+    return "(" + ", ".join(name if n == 1 else f"{name}×{n}" for name, n in groups) + ")"
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    if executemany:
+        if not parameters:
+            return "0 × ()"
+        return f"{len(parameters)} × {_shape(parameters[0])}"
+    return _shape(parameters or ())
+
+
+def explain_plan(connection, statement: str, parameters, executemany: bool) -> list[str] | None:
+    """
+    EXPLAIN QUERY PLAN через DBAPI-курсор того же соединения (события SQLAlchemy
+    для него не срабатывают). Строки плана - detail с отступом по вложенности
+    """
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        rows = cursor.fetchall()
+    except Exception as exc:
+        return [f"не удалось получить план: {exc}"]
+    finally:
+        cursor.close()
+    depth = {0: -1}
+    plan = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        plan.append("  " * depth[node] + detail)
+    return plan
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов: каждая запись - строка JSON в ротируемом файле,
+    в памяти - сводка по шаблонам запросов (число, суммарное и худшее время,
+    план). План снимается один раз на шаблон, при первом медленном выполнении.
+    Вызывается из after_cursor_execute (app/database/metrics.py), то есть в
+    потоке цикла событий - блокировки не нужны
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        path: str,
+        max_bytes: int,
+        backups: int,
+        max_statements: int,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_statements = max_statements
+        self.statements: dict[str, dict] = {}
+        self.logged = 0
+        self.dropped = 0
+        self._logger: logging.Logger | None = None
+
+    def _get_logger(self) -> logging.Logger:
+        # Файл открывается при первой записи, чтобы импорт приложения его не создавал
+        if self._logger is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("app.slow_queries")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def observe(
+        self,
+        connection,
+        statement: str,
+        parameters,
+        executemany: bool,
+        elapsed: float,
+        rows_written: int,
+        route: str,
+        method: str,
+    ) -> None:
+        sql = normalize_sql(statement)
+        elapsed_ms = elapsed * 1000
+        entry = self.statements.get(sql)
+        first = entry is None
+        if first:
+            if len(self.statements) >= self.max_statements:
+                # Сводка заполнена: запрос пишется в файл, но не учитывается в top-N
+                self.dropped += 1
+            else:
+                entry = self.statements[sql] = {
+                    "sql": sql,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows_written": 0,
+                    "routes": {},
+                    "methods": {},
+                    "plan": explain_plan(connection, statement, parameters, executemany),
+                }
+        if entry is not None:
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows_written"] += rows_written
+            entry["routes"][route] = entry["routes"].get(route, 0) + 1
+            entry["methods"][method] = entry["methods"].get(method, 0) + 1
+
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed_ms, 3),
+            "rows_written": rows_written,
+            "route": route,
+            "method": method,
+            "sql": sql,
+            "params": parameter_shape(parameters, executemany),
+        }
+        if first and entry is not None and entry["plan"] is not None:
+            record["plan"] = entry["plan"]
+        self.logged += 1
+        self._get_logger().info(json.dumps(record, ensure_ascii=False))
+
+    def top(self, limit: int) -> list[dict]:
+        """Шаблоны запросов с наибольшим суммарным временем"""
+        entries = sorted(self.statements.values(), key=lambda e: e["total_ms"], reverse=True)
+        return [
+            {
+                **entry,
+                "total_ms": round(entry["total_ms"], 3),
+                "max_ms": round(entry["max_ms"], 3),
+                "mean_ms": round(entry["total_ms"] / entry["count"], 3),
+            }
+            for entry in entries[:limit]
+        ]
+
+    def stats(self, limit: int) -> dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "path": self.path,
+            "logged": self.logged,
+            "statements": len(self.statements),
+            "dropped": self.dropped,
+            "top": self.top(limit),
+        }
+
+    def clear(self) -> None:
+        self.statements.clear()
+        self.logged = 0
+        self.dropped = 0
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    path=settings.SLOW_QUERY_LOG_PATH,
+    max_bytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+    backups=settings.SLOW_QUERY_LOG_BACKUPS,
+    max_statements=settings.SLOW_QUERY_MAX_STATEMENTS,
+)
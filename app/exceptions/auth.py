@@ -21,6 +21,10 @@ class UserNotFoundError(MyAppError):
     detail = "Пользователя не существует"
 
 
+class PasswordHasherOverloadedError(MyAppError):
+    detail = "Очередь хэширования паролей переполнена"
+
+
 class InvalidTokenHTTPError(MyAppHTTPError):
     status_code = 401
     detail = "Неверный токен доступа"
@@ -53,3 +57,8 @@ class InvalidPasswordHTTPError(MyAppHTTPError):
 class IsNotAdminHTTPError(MyAppHTTPError):
     status_code = 403
     detail = "Недостаточно прав"
+
+
+class PasswordHasherOverloadedHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервис перегружен, повторите попытку позже"
@@ -24,5 +24,9 @@ class ObjectAlreadyExistsError(MyAppError):
     detail = "Похожий объект уже существует"
 
 
+class ReadOnlySessionError(MyAppError):
+    detail = "Запись через сессию только для чтения"
+
+
 class InvalidDateRangeError(MyAppError):
     detail = "Дата заезда не может быть позже даты выезда"
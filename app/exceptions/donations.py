@@ -0,0 +1,19 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class DonationIntakeOverloadedError(MyAppError):
+    detail = "Очередь приёма пожертвований переполнена"
+
+
+class DonationIntakeOverloadedHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервис перегружен, повторите попытку позже"
+
+
+class InvalidExportPeriodError(MyAppError):
+    detail = "Начало периода выгрузки должно быть раньше его конца"
+
+
+class InvalidExportPeriodHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Начало периода выгрузки должно быть раньше его конца"
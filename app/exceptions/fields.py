@@ -0,0 +1,19 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidFieldsError(MyAppError):
+    detail = "Неизвестное поле в параметре fields"
+
+
+class InvalidFieldsHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неизвестное поле в параметре fields"
+
+
+class InvalidIncludeError(MyAppError):
+    detail = "Неизвестная связь в параметре include"
+
+
+class InvalidIncludeHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неизвестная связь в параметре include"
@@ -0,0 +1,19 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidCursorError(MyAppError):
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidSortKeyError(MyAppError):
+    detail = "Сортировка по этому полю не поддерживается"
+
+
+class InvalidCursorHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Неверный курсор пагинации"
+
+
+class InvalidSortKeyHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Сортировка по этому полю не поддерживается"
@@ -0,0 +1,35 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class RateLimitExceededError(MyAppError):
+    detail = "Превышен лимит запросов"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+class AdmissionRejectedError(MyAppError):
+    detail = "Очередь запросов переполнена"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
+
+
+class RateLimitExceededHTTPError(MyAppHTTPError):
+    status_code = 429
+    detail = "Слишком много запросов, повторите попытку позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+class AdmissionRejectedHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервис перегружен, повторите попытку позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
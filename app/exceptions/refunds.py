@@ -0,0 +1,5 @@
+from app.exceptions.base import MyAppError
+
+
+class ProjectNotFailedError(MyAppError):
+    detail = "Проект ещё идёт или собрал цель: возвраты не нужны"
@@ -0,0 +1,10 @@
+from app.exceptions.base import MyAppError, MyAppHTTPError
+
+
+class InvalidSearchQueryError(MyAppError):
+    detail = "Пустой поисковый запрос"
+
+
+class InvalidSearchQueryHTTPError(MyAppHTTPError):
+    status_code = 400
+    detail = "Пустой поисковый запрос"
@@ -0,0 +1,273 @@
+"""
+Генерация детерминированной БД заданного масштаба для замеров и оценки размеров.
+
+Запуск: python -m app.jobs.generate_data path [--scale-factor 1] [--seed 0] [--force]
+
+Схема создаётся миграциями alembic, данные пишутся пачками через executemany,
+вторичные индексы и триггеры FTS создаются уже после загрузки. Одинаковые
+seed и scale factor дают побайтно одинаковый файл при одной версии SQLite.
+"""
+import argparse
+import base64
+import bisect
+import itertools
+import os
+import random
+import string
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import bcrypt
+from sqlalchemy import Connection, MetaData, column, create_engine, event, insert, table, text
+
+from app.config import settings
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Объёмы при scale factor 1 и минимальные объёмы при малых масштабах
+BASE_COUNTS = {
+    "users": 10_000,
+    "categories": 20,
+    "projects": 10_000,
+    "donations": 1_000_000,
+    "rewards": 30_000,
+}
+MIN_COUNTS = {"users": 10, "categories": 3, "projects": 10, "donations": 100, "rewards": 10}
+
+# Популярность проектов по закону Ципфа: доля проекта ранга k ~ 1 / k**s
+ZIPF_EXPONENT = 1.1
+INSERT_CHUNK_SIZE = 10_000
+
+# Пользователь 1 - администратор; пароль пользователя - password_for(user_id)
+ADMIN_EMAIL = "admin@example.com"
+# bcrypt дорогой, поэтому хэшей немного и они повторяются по кругу
+PASSWORD_POOL_SIZE = 4
+
+START = datetime(2025, 1, 1)
+PERIOD = timedelta(days=365)
+WORDS = (
+    "игра", "музыка", "фильм", "книга", "город", "сад", "робот", "школа", "театр",
+    "комикс", "настольная", "альбом", "приложение", "музей", "фестиваль", "фото",
+    "лаборатория", "экспедиция", "журнал", "мастерская",
+)
+# bcrypt кодирует соль base64 со своим алфавитом
+BCRYPT_BASE64 = str.maketrans(
+    string.ascii_uppercase + string.ascii_lowercase + string.digits + "+/",
+    "./" + string.ascii_uppercase + string.ascii_lowercase + string.digits,
+)
+
+
+def scaled_counts(scale_factor: float) -> dict[str, int]:
+    return {
+        table: max(MIN_COUNTS[table], round(count * scale_factor))
+        for table, count in BASE_COUNTS.items()
+    }
+
+
+def password_for(user_id: int) -> str:
+    return f"password-{user_id % PASSWORD_POOL_SIZE}"
+
+
+def _password_hashes(rnd: random.Random) -> list[str]:
+    """Хэши с солью из rnd - одинаковые для одного seed; стоимость как у приложения"""
+    hashes = []
+    for index in range(PASSWORD_POOL_SIZE):
+        salt = base64.b64encode(rnd.randbytes(16)).decode().rstrip("=").translate(BCRYPT_BASE64)
+        prefix = f"$2b${settings.BCRYPT_ROUNDS:02d}${salt}".encode()
+        hashes.append(bcrypt.hashpw(f"password-{index}".encode(), prefix).decode())
+    return hashes
+
+
+def _text(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choices(WORDS, k=words))
+
+
+def _timestamp(offset: timedelta) -> str:
+    # Целые секунды в формате CURRENT_TIMESTAMP, как у строк, созданных приложением
+    return (START + offset).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _chunks(rows: Iterator[dict]) -> Iterator[list[dict]]:
+    while chunk := list(itertools.islice(rows, INSERT_CHUNK_SIZE)):
+        yield chunk
+
+
+def _users(counts, hashes) -> Iterator[dict]:
+    for user_id in range(1, counts["users"] + 1):
+        created_at = _timestamp(PERIOD * (user_id - 1) / counts["users"] / 2)
+        yield {
+            "id": user_id,
+            "name": f"Пользователь {user_id}",
+            "email": ADMIN_EMAIL if user_id == 1 else f"user{user_id}@example.com",
+            "hashed_password": hashes[user_id % PASSWORD_POOL_SIZE],
+            "role_id": 2 if user_id == 1 else 1,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _projects(rnd, counts) -> Iterator[dict]:
+    for project_id in range(1, counts["projects"] + 1):
+        created_at = _timestamp(PERIOD * (project_id - 1) / counts["projects"] / 2)
+        date_start = int((START - datetime(1970, 1, 1)).total_seconds()) + project_id * 600
+        yield {
+            "id": project_id,
+            "creator_id": rnd.randint(1, counts["users"]),
+            "title": _text(rnd, 3),
+            "description": _text(rnd, 12),
+            "target_amount": rnd.randrange(10_000, 10_000_000, 1_000),
+            "collected_amount": 0,
+            "category_id": rnd.randint(1, counts["categories"]),
+            "is_active": rnd.random() < 0.8,
+            "date_start": date_start,
+            "date_end": date_start + rnd.randint(30, 120) * 86400,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _donations(rnd, counts) -> Iterator[dict]:
+    # Ранги популярности раздаются проектам в случайном порядке
+    popularity = list(range(1, counts["projects"] + 1))
+    rnd.shuffle(popularity)
+    cum_weights = list(itertools.accumulate(1 / rank**ZIPF_EXPONENT for rank in range(1, len(popularity) + 1)))
+    total_weight = cum_weights[-1]
+    total = counts["donations"]
+    for index in range(total):
+        # Время растёт вместе с id, как у настоящих пожертвований
+        created_at = _timestamp(PERIOD / 2 + PERIOD * index / total / 2)
+        rank = bisect.bisect(cum_weights, rnd.random() * total_weight)
+        yield {
+            "project_id": popularity[min(rank, len(popularity) - 1)],
+            "user_id": rnd.randint(1, counts["users"]),
+            "amount": rnd.choice((1, 2, 5, 10, 20, 50, 100, 500)) * 10_000,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _rewards(rnd, counts) -> Iterator[dict]:
+    for _ in range(counts["rewards"]):
+        yield {
+            "project_id": rnd.randint(1, counts["projects"]),
+            "title": _text(rnd, 2),
+            "description": _text(rnd, 6),
+            "required_quantity": rnd.randint(1, 100),
+            "created_at": _timestamp(timedelta()),
+            "updated_at": _timestamp(timedelta()),
+        }
+
+
+def _load(connection: Connection, metadata: MetaData, name: str, rows: Iterator[dict]) -> None:
+    # Колонки без типов: значения уходят в SQLite как есть, без обработчиков DateTime
+    target = table(name, *(column(c.name) for c in metadata.tables[name].columns))
+    for chunk in _chunks(rows):
+        connection.execute(insert(target), chunk)
+
+
+def generate(db_path: str, scale_factor: float = 1.0, seed: int = 0) -> dict[str, int]:
+    """Заполняет пустую БД после миграций. Возвращает объёмы таблиц"""
+    counts = scaled_counts(scale_factor)
+    rnd = random.Random(seed)
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    @event.listens_for(engine, "connect")
+    def bulk_load_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.close()
+
+    metadata = MetaData()
+    metadata.reflect(engine)
+    with engine.begin() as connection:
+        # Индексы и триггеры (в т.ч. FTS) строятся один раз после загрузки
+        deferred = connection.execute(
+            text(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE type IN ('index', 'trigger') AND sql IS NOT NULL ORDER BY type, name"
+            )
+        ).all()
+        for type_, name, _ in deferred:
+            connection.execute(text(f'DROP {type_.upper()} "{name}"'))
+
+        created_at = _timestamp(timedelta())
+        _load(connection, metadata, "roles", iter([
+            {"id": 1, "name": "user", "created_at": created_at, "updated_at": created_at},
+            {"id": 2, "name": "admin", "created_at": created_at, "updated_at": created_at},
+        ]))
+        _load(connection, metadata, "categories", (
+            {"id": category_id, "name": f"Категория {category_id}", "created_at": created_at, "updated_at": created_at}
+            for category_id in range(1, counts["categories"] + 1)
+        ))
+        _load(connection, metadata, "users", _users(counts, _password_hashes(rnd)))
+        _load(connection, metadata, "projects", _projects(rnd, counts))
+        _load(connection, metadata, "donations", _donations(rnd, counts))
+        _load(connection, metadata, "rewards", _rewards(rnd, counts))
+
+        for _, _, sql in deferred:
+            connection.execute(text(sql))
+        connection.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+
+        # Счётчики проектов и project_stats согласованы с пожертвованиями;
+        # считаются после индексов - коррелированный SUM идёт по ix_donations_project_id_amount
+        connection.execute(text(
+            "UPDATE projects SET collected_amount = COALESCE("
+            "(SELECT SUM(amount) FROM donations WHERE project_id = projects.id), 0)"
+        ))
+        connection.execute(
+            text(
+                "INSERT INTO project_stats (project_id, total_amount, donations_count, "
+                "donors_count, max_donation, last_donation_at, created_at, updated_at) "
+                "SELECT project_id, SUM(amount), COUNT(*), COUNT(DISTINCT user_id), "
+                "MAX(amount), MAX(created_at), :created_at, :created_at "
+                "FROM donations GROUP BY project_id ORDER BY project_id"
+            ),
+            {"created_at": created_at},
+        )
+        connection.execute(text("ANALYZE"))
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+        connection.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    engine.dispose()
+    return counts
+
+
+def create_database(db_path: str, scale_factor: float = 1.0, seed: int = 0) -> dict[str, int]:
+    """Создаёт файл БД миграциями alembic и заполняет его"""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT_DIR,
+        env=os.environ | {"DB_NAME": os.path.abspath(db_path)},
+        check=True,
+    )
+    return generate(db_path, scale_factor=scale_factor, seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация тестовых данных заданного масштаба")
+    parser.add_argument("path")
+    parser.add_argument("--scale-factor", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="перезаписать существующий файл")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        if not args.force:
+            parser.error(f"{args.path} уже существует, используйте --force")
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(args.path + suffix):
+                os.remove(args.path + suffix)
+
+    started = time.perf_counter()
+    counts = create_database(args.path, scale_factor=args.scale_factor, seed=args.seed)
+    print(", ".join(f"{table}: {count}" for table, count in counts.items()))
+    print(f"Готово за {time.perf_counter() - started:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Массовая загрузка проектов, пожертвований или наград из файла NDJSON/CSV.
+
+Запуск: python -m app.jobs.import_bulk {projects,donations,rewards} path [--format ndjson|csv]
+"""
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+
+from app.database.database import async_session_maker_null_pool
+from app.database.db_manager import DBManager
+from app.schemes.bulk import SBulkImportReport
+from app.services.bulk_import import IMPORT_TARGETS, BulkImportService
+from app.utils.bulk import BULK_FORMATS, iter_records
+
+CHUNK_SIZE = 1 << 16
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def import_bulk(target: str, path: str, format: str) -> SBulkImportReport:
+    """Загружает файл теми же пачками и с теми же проверками, что и /bulk эндпоинты"""
+    async with DBManager(session_factory=async_session_maker_null_pool) as db:
+        return await BulkImportService(db).import_records(
+            target, iter_records(read_chunks(path), format)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовая загрузка данных из NDJSON/CSV")
+    parser.add_argument("target", choices=sorted(IMPORT_TARGETS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=BULK_FORMATS)
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    report = asyncio.run(import_bulk(args.target, args.path, format))
+    print(f"Строк: {report.total}, загружено: {report.inserted}, с ошибками: {report.failed}")
+    for error in report.errors:
+        print(f"  строка {error.row}: {error.error}")
+
+
+if __name__ == "__main__":
+    main()
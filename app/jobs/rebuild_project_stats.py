@@ -0,0 +1,37 @@
+"""
+Полный пересчёт таблицы project_stats по таблице donations.
+
+Запуск: python -m app.jobs.rebuild_project_stats [--chunk-size 500]
+"""
+import argparse
+import asyncio
+
+from app.database.database import async_session_maker_null_pool
+from app.database.db_manager import DBManager
+
+
+async def rebuild_project_stats(chunk_size: int = 500) -> int:
+    """Пересчитывает агрегаты пачками по chunk_size проектов, каждая пачка в своей транзакции"""
+    chunks = 0
+    last_id = 0
+    async with DBManager(session_factory=async_session_maker_null_pool) as db:
+        while True:
+            last_id = await db.project_stats.rebuild(after_id=last_id, limit=chunk_size)
+            if last_id is None:
+                break
+            await db.commit()
+            chunks += 1
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пересчёт агрегатов пожертвований проектов")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    chunks = asyncio.run(rebuild_project_stats(chunk_size=args.chunk_size))
+    print(f"Обработано пачек: {chunks}")
+
+
+if __name__ == "__main__":
+    main()
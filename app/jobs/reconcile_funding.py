@@ -0,0 +1,39 @@
+"""
+Пересчёт собранных сумм проектов по таблице donations.
+
+Запуск: python -m app.jobs.reconcile_funding [--chunk-size 500]
+"""
+import argparse
+import asyncio
+
+from app.database.database import async_session_maker_null_pool
+from app.database.db_manager import DBManager
+
+
+async def reconcile_funding(chunk_size: int = 500) -> int:
+    """Исправляет расхождения пачками по chunk_size проектов, каждая пачка в своей транзакции"""
+    repaired = 0
+    last_id = 0
+    async with DBManager(session_factory=async_session_maker_null_pool) as db:
+        while True:
+            last_id, fixed = await db.projects.reconcile_collected(
+                after_id=last_id, limit=chunk_size
+            )
+            if last_id is None:
+                break
+            await db.commit()
+            repaired += fixed
+    return repaired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пересчёт собранных сумм проектов")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    repaired = asyncio.run(reconcile_funding(chunk_size=args.chunk_size))
+    print(f"Исправлено проектов: {repaired}")
+
+
+if __name__ == "__main__":
+    main()
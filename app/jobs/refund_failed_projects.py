@@ -0,0 +1,78 @@
+"""
+Возвраты пожертвований проектов, не собравших цель к date_end.
+
+Прерванный запуск можно повторить: каждый проект продолжается с последней
+записанной пачки (refund_checkpoints), завершённые проекты пропускаются.
+
+Запуск: python -m app.jobs.refund_failed_projects [--project-id 42] [--chunk-size 500] [--throttle-ratio 1.0]
+"""
+import argparse
+import asyncio
+import time
+
+from app.config import settings
+from app.database.database import async_session_maker_null_pool
+from app.database.db_manager import DBManager
+from app.exceptions.base import ObjectNotFoundError
+from app.exceptions.refunds import ProjectNotFailedError
+from app.services.refunds import RefundsService
+
+PROJECTS_PAGE_SIZE = 100
+
+
+async def refund_failed_projects(
+    project_id: int | None = None,
+    chunk_size: int = settings.REFUND_CHUNK_SIZE,
+    throttle_ratio: float = settings.REFUND_THROTTLE_RATIO,
+) -> tuple[int, int, int]:
+    """Возвращает число обработанных проектов, число и сумму возвратов за все запуски"""
+    projects = refunds_count = refunds_amount = 0
+    now = int(time.time())
+    async with DBManager(session_factory=async_session_maker_null_pool) as db:
+        service = RefundsService(db)
+        if project_id is not None:
+            await service.check_failed(project_id, now=now)
+            project_ids = [project_id]
+        else:
+            project_ids = await service.get_failed_project_ids(
+                now=now, after_id=0, limit=PROJECTS_PAGE_SIZE
+            )
+        while project_ids:
+            for failed_id in project_ids:
+                checkpoint = await service.refund_project(
+                    failed_id, chunk_size=chunk_size, throttle_ratio=throttle_ratio
+                )
+                projects += 1
+                refunds_count += checkpoint.refunds_count
+                refunds_amount += checkpoint.refunds_amount
+            if project_id is not None:
+                break
+            project_ids = await service.get_failed_project_ids(
+                now=now, after_id=project_ids[-1], limit=PROJECTS_PAGE_SIZE
+            )
+            await db.rollback()
+    return projects, refunds_count, refunds_amount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Возвраты пожертвований неуспешных проектов")
+    parser.add_argument("--project-id", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=settings.REFUND_CHUNK_SIZE)
+    parser.add_argument("--throttle-ratio", type=float, default=settings.REFUND_THROTTLE_RATIO)
+    args = parser.parse_args()
+
+    try:
+        projects, count, amount = asyncio.run(
+            refund_failed_projects(
+                project_id=args.project_id,
+                chunk_size=args.chunk_size,
+                throttle_ratio=args.throttle_ratio,
+            )
+        )
+    except (ObjectNotFoundError, ProjectNotFailedError) as exc:
+        raise SystemExit(str(exc))
+    print(f"Проектов: {projects}, возвратов: {count}, сумма: {amount}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    COUNT_BUCKETS,
+    RequestMetrics,
+    metrics,
+    request_metrics,
+    route_label,
+)
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP-запросы по маршрутам и статусам", ("method", "route", "status")
+)
+http_duration = metrics.histogram(
+    "http_request_duration_seconds", "Длительность HTTP-запросов", ("method", "route")
+)
+http_in_flight = metrics.gauge("http_requests_in_flight", "Запросы в обработке")
+http_db_statements = metrics.histogram(
+    "http_request_db_statements",
+    "SQL-запросов на один HTTP-запрос (рост - признак N+1)",
+    ("method", "route"),
+    COUNT_BUCKETS,
+)
+http_db_seconds = metrics.histogram(
+    "http_request_db_seconds", "Время SQL в одном HTTP-запросе", ("method", "route")
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware (без BaseHTTPMiddleware, чтобы не создавать задачу на запрос).
+    Маршрут берётся шаблоном пути (/api/projects/{project_id}), чтобы число
+    рядов метрик не зависело от идентификаторов в URL
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestMetrics(scope)
+        token = request_metrics.set(stats)
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            request_metrics.reset(token)
+            labels = (scope["method"], route_label(scope))
+            http_requests.inc((*labels, str(status)))
+            http_duration.observe(elapsed, labels)
+            http_db_statements.observe(stats.statements, labels)
+            http_db_seconds.observe(stats.db_time, labels)
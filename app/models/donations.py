@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 from typing import TYPE_CHECKING
@@ -8,9 +8,17 @@ if TYPE_CHECKING:
 
 class DonationModel(Base):
    __tablename__ = "donations"
+   __table_args__ = (
+       Index("ix_donations_project_id_id", "project_id", "id"),
+       Index("ix_donations_user_id_id", "user_id", "id"),
+       Index("ix_donations_created_at", "created_at"),
+       Index("ix_donations_project_id_user_id", "project_id", "user_id"),
+       Index("ix_donations_project_id_amount", "project_id", "amount"),
+   )
    id: Mapped[int] = mapped_column(primary_key=True)
    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+   # Сумма в копейках
    amount: Mapped[int] = mapped_column(Integer, nullable=False)
 
    project: Mapped["ProjectModel"] = relationship("ProjectModel", foreign_keys=[project_id])
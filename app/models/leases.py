@@ -0,0 +1,13 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class LeaseModel(Base):
+    """Аренда фоновой задачи: выполняет тот воркер, чья аренда не истекла"""
+
+    __tablename__ = "leases"
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Unix-время окончания аренды, секунды
+    expires_at: Mapped[int] = mapped_column(Integer, nullable=False)
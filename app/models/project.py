@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Integer, String, Boolean, ForeignKey
+from sqlalchemy import Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 if TYPE_CHECKING:
@@ -10,6 +10,12 @@ if TYPE_CHECKING:
 
 class ProjectModel(Base):
    __tablename__ = "projects"
+   __table_args__ = (
+       Index("ix_projects_creator_id_id", "creator_id", "id"),
+       Index("ix_projects_category_id_id", "category_id", "id"),
+       Index("ix_projects_is_active_date_end", "is_active", "date_end"),
+       Index("ix_projects_date_end", "date_end"),
+   )
    id: Mapped[int] = mapped_column(Integer, primary_key=True)
    creator_id: Mapped[int] = mapped_column(
        ForeignKey("users.id"),
@@ -17,8 +23,14 @@ class ProjectModel(Base):
    )
    title: Mapped[str] = mapped_column(String(255), nullable=False)
    description: Mapped[str] = mapped_column(String(255), nullable=False)
-   target_amount: Mapped[str] = mapped_column(String(65535), nullable=False)
-   collected_amount: Mapped[str] = mapped_column(String(65535), nullable=False)
+   # Суммы хранятся в копейках
+   target_amount: Mapped[int] = mapped_column(Integer, nullable=False)
+   collected_amount: Mapped[int] = mapped_column(
+       Integer,
+       nullable=False,
+       default=0,
+       server_default="0"
+   )
    category_id: Mapped[int] = mapped_column(
        ForeignKey("categories.id"),
        nullable=False
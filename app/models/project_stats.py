@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class ProjectStatsModel(Base):
+    """Агрегаты пожертвований проекта, обновляются вместе с таблицей donations"""
+
+    __tablename__ = "project_stats"
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), primary_key=True)
+    total_amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    donations_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    donors_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    max_donation: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_donation_at: Mapped[datetime | None] = mapped_column(nullable=True)
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database.database import Base
+
+
+class RefundModel(Base):
+    """Возврат пожертвования неуспешного проекта, не больше одного на пожертвование"""
+
+    __tablename__ = "refunds"
+    __table_args__ = (Index("ix_refunds_project_id", "project_id"),)
+    id: Mapped[int] = mapped_column(primary_key=True)
+    donation_id: Mapped[int] = mapped_column(ForeignKey("donations.id"), unique=True, nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # Суммы хранятся в копейках
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RefundCheckpointModel(Base):
+    """Прогресс возвратов проекта: последнее обработанное пожертвование и итоги"""
+
+    __tablename__ = "refund_checkpoints"
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), primary_key=True)
+    last_donation_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    refunds_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    refunds_amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_at: Mapped[datetime | None] = mapped_column(nullable=True)
@@ -1,15 +1,19 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import String, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.database import Base
 if TYPE_CHECKING:
+   from app.models.project import ProjectModel
+
 
-   from app.models.rewards import RewardModel
 class RewardModel(Base):
    __tablename__ = "rewards"
+   __table_args__ = (Index("ix_rewards_project_id_id", "project_id", "id"),)
    id: Mapped[int] = mapped_column(primary_key=True)
+   project_id: Mapped[int | None] = mapped_column(ForeignKey("projects.id"), nullable=True)
 
    title: Mapped[str] = mapped_column(String(255), nullable=True)
    description: Mapped[str] = mapped_column(String(255), nullable=True)
    required_quantity: Mapped[int] = mapped_column(Integer, nullable=True)
-  
\ No newline at end of file
+
+   project: Mapped["ProjectModel"] = relationship("ProjectModel", foreign_keys=[project_id])
@@ -1,58 +1,306 @@
+import functools
+import inspect
+import json
+from datetime import datetime
+
 from pydantic import BaseModel
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, tuple_, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
 
 
+from app.config import settings
 from app.database.database import Base
-from app.exceptions.base import ObjectAlreadyExistsError
+from app.exceptions.base import ObjectAlreadyExistsError, ReadOnlySessionError
+from app.exceptions.pagination import InvalidCursorError, InvalidSortKeyError
+from app.utils.cache import MISSING, query_cache
+from app.utils.fields import partial_schema
+from app.utils.metrics import repository_method
+from app.utils.pagination import decode_cursor, encode_cursor, seek_value
+from app.utils.serialization import list_adapter
+
+
+def track_method(method):
+    """Отмечает SQL метода как Класс.метод для метрик (см. app/database/metrics.py)"""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        token = repository_method.set(f"{type(self).__name__}.{method.__name__}")
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            repository_method.reset(token)
+
+    return wrapper
+
+
+def _track_methods(cls) -> None:
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            setattr(cls, name, track_method(attr))
 
 
 class BaseRepository:
     model: Base = None
     schema: BaseModel = None
+    # Колонки, по которым разрешена курсорная пагинация (в паре с id)
+    sort_keys: tuple[str, ...] = ("id",)
+    # Кэшировать результаты чтения (работает при включённом QUERY_CACHE_ENABLED)
+    cache_enabled: bool = False
 
     def __init__(self, session):
         self.session = session
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _track_methods(cls)
+
+    def _cache_generation(self, *filter) -> int | None:
+        """
+        Поколение таблицы для ключа кэша или None, если запрос не кэшируется:
+        кэш выключен, есть произвольные выражения фильтрации или таблица
+        уже изменена в текущей (ещё не закоммиченной) транзакции
+        """
+        table = self.model.__tablename__
+        if (
+            not self.cache_enabled
+            or not settings.QUERY_CACHE_ENABLED
+            or filter
+            or table in self.session.info.get("dirty_tables", ())
+        ):
+            return None
+        return query_cache.generation(table)
+
+    def _read_schema(self, fields: tuple[str, ...] | None) -> type[BaseModel]:
+        """Схема ответа: полная или частичная для fields (см. app/utils/fields.py)"""
+        if fields is None:
+            return self.schema
+        return partial_schema(self.schema, fields)
+
+    def _schema_columns(self, schema: type[BaseModel]) -> list | None:
+        """
+        Колонки таблицы для полей схемы или None, если в схеме есть поля,
+        которых нет в таблице (тогда читаем ORM-объекты)
+        """
+        columns = self.model.__table__.columns
+        fields = schema.model_fields
+        if any(name not in columns for name in fields):
+            return None
+        return [columns[name] for name in fields]
+
+    def _select(self, schema: type[BaseModel], *extra_columns: str):
+        """
+        Быстрое чтение: выбираются только колонки схемы как Core-строки,
+        без создания ORM-объектов и учёта в identity map.
+        extra_columns - колонки, нужные помимо полей схемы (например, для курсора)
+        """
+        columns = self._schema_columns(schema)
+        if columns is None:
+            return select(self.model)
+        table_columns = self.model.__table__.columns
+        extra = [
+            table_columns[name]
+            for name in extra_columns
+            if name not in schema.model_fields
+        ]
+        return select(*columns, *extra)
+
+    def _fetch_rows(self, schema: type[BaseModel], result) -> list:
+        if self._schema_columns(schema) is None:
+            return result.scalars().all()
+        return result.mappings().all()
+
+    def _to_schemas(self, schema: type[BaseModel], rows) -> list[BaseModel]:
+        if self._schema_columns(schema) is None:
+            return [
+                schema.model_validate(model, from_attributes=True) for model in rows
+            ]
+        # Весь список валидируется одним вызовом в pydantic-core
+        return list_adapter(schema).validate_python(rows)
+
+    def _mark_dirty(self) -> None:
+        """
+        Отмечает таблицу изменённой: кэш сбрасывается сейчас и ещё раз после коммита.
+        Вызывается каждым методом записи, поэтому здесь же запрет записи через
+        сессию только для чтения (ReadDBDep)
+        """
+        if self.session.info.get("read_only"):
+            raise ReadOnlySessionError
+        table = self.model.__tablename__
+        self.session.info.setdefault("dirty_tables", set()).add(table)
+        query_cache.invalidate(table)
+
     async def get_filtered(
         self,
         limit: int | None = None,
         offset: int | None = None,
         *filter,
+        fields: tuple[str, ...] | None = None,
         **filter_by,
     ) -> list[BaseModel]:
         filter_by = {k: v for k, v in filter_by.items() if v is not None}
         filter_ = [v for v in filter if v is not None]
+        schema = self._read_schema(fields)
 
-        query = select(self.model).filter(*filter_).filter_by(**filter_by)
+        generation = self._cache_generation(*filter_)
+        cache_key = (
+            "get_filtered",
+            limit,
+            offset,
+            fields,
+            tuple(sorted(filter_by.items())),
+        )
+        if generation is not None:
+            cached = query_cache.get(self.model.__tablename__, generation, cache_key)
+            if cached is not MISSING:
+                return list(cached)
+
+        query = self._select(schema).filter(*filter_).filter_by(**filter_by)
 
         if limit is not None and offset is not None:
             query = query.limit(limit).offset(offset)
         # print(query.compile(bind=engine, compile_kwargs={"literal_binds": True}))
         result = await self.session.execute(query)
-        result = [
-            self.schema.model_validate(model, from_attributes=True)
-            for model in result.scalars().all()
-        ]
+        result = self._to_schemas(schema, self._fetch_rows(schema, result))
 
+        if generation is not None:
+            query_cache.set(self.model.__tablename__, generation, cache_key, list(result))
         return result
 
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        *filter,
+        sort_key: str = "id",
+        descending: bool = False,
+        fields: tuple[str, ...] | None = None,
+        **filter_by,
+    ) -> tuple[list[BaseModel], str | None]:
+        """
+        Курсорная (keyset) пагинация по паре (sort_key, id).
+        Возвращает страницу и курсор следующей страницы (None, если страница последняя)
+        """
+        if sort_key not in self.sort_keys:
+            raise InvalidSortKeyError
+        if limit < 1:
+            return [], None
+
+        filter_by = {k: v for k, v in filter_by.items() if v is not None}
+        filter_ = [v for v in filter if v is not None]
+        schema = self._read_schema(fields)
+
+        generation = self._cache_generation(*filter_)
+        cache_key = (
+            "get_page",
+            limit,
+            cursor,
+            sort_key,
+            descending,
+            fields,
+            tuple(sorted(filter_by.items())),
+        )
+        if generation is not None:
+            cached = query_cache.get(self.model.__tablename__, generation, cache_key)
+            if cached is not MISSING:
+                items, next_cursor = cached
+                return list(items), next_cursor
+
+        id_column = self.model.id
+        sort_column = getattr(self.model, sort_key)
+        query = self._select(schema, sort_key).filter(*filter_).filter_by(**filter_by)
+
+        if cursor is not None:
+            cursor_key, value, last_id = decode_cursor(cursor)
+            if cursor_key != sort_key:
+                raise InvalidCursorError
+            if sort_key == "id":
+                seek = id_column < last_id if descending else id_column > last_id
+            else:
+                # Сравнение кортежей SQLite превращает в поиск по индексу sort_key
+                position = tuple_(sort_column, id_column)
+                last = tuple_(seek_value(value), last_id)
+                seek = position < last if descending else position > last
+            query = query.filter(seek)
+
+        order_by = [id_column] if sort_key == "id" else [sort_column, id_column]
+        if descending:
+            order_by = [column.desc() for column in order_by]
+        # Лишняя строка показывает, есть ли следующая страница
+        query = query.order_by(*order_by).limit(limit + 1)
+
+        result = await self.session.execute(query)
+        rows = self._fetch_rows(schema, result)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            if self._schema_columns(schema) is None:
+                value, last_id = getattr(last, sort_key), last.id
+            else:
+                value, last_id = last[sort_key], last["id"]
+            next_cursor = encode_cursor(sort_key, value, last_id)
+
+        items = self._to_schemas(schema, rows)
+        if generation is not None:
+            query_cache.set(
+                self.model.__tablename__, generation, cache_key, (list(items), next_cursor)
+            )
+        return items, next_cursor
+
     async def get_all(self, *args, **kwargs) -> list[BaseModel]:
         """Возращает все записи в БД из связаной таблицы"""
         return await self.get_filtered(*args, **kwargs)
 
-    async def get_one_or_none(self, **filter_by) -> None | BaseModel:
-        query = select(self.model).filter_by(**filter_by)
+    async def get_one_or_none(
+        self, fields: tuple[str, ...] | None = None, **filter_by
+    ) -> None | BaseModel:
+        schema = self._read_schema(fields)
+        generation = self._cache_generation()
+        cache_key = ("get_one_or_none", fields, tuple(sorted(filter_by.items())))
+        if generation is not None:
+            cached = query_cache.get(self.model.__tablename__, generation, cache_key)
+            if cached is not MISSING:
+                return cached
+
+        query = self._select(schema).filter_by(**filter_by)
 
         result = await self.session.execute(query)
 
-        model = result.scalars().one_or_none()
-        if model is None:
-            return None
-        result = self.schema.model_validate(model, from_attributes=True)
-        return result
+        if self._schema_columns(schema) is None:
+            row = result.scalars().one_or_none()
+        else:
+            row = result.mappings().one_or_none()
+        model = None if row is None else self._to_schemas(schema, [row])[0]
+        if generation is not None:
+            query_cache.set(self.model.__tablename__, generation, cache_key, model)
+        return model
+
+    async def get_version(
+        self, *filter, **filter_by
+    ) -> tuple[int, int | None, datetime | None]:
+        """
+        Метаданные выборки для ETag/Last-Modified без чтения самих строк:
+        количество строк, максимальный id и максимальный updated_at
+        """
+        filter_by = {k: v for k, v in filter_by.items() if v is not None}
+        filter_ = [v for v in filter if v is not None]
+        query = (
+            select(
+                func.count(),
+                func.max(self.model.id),
+                func.max(self.model.updated_at),
+            )
+            .select_from(self.model)
+            .filter(*filter_)
+            .filter_by(**filter_by)
+        )
+        count, max_id, last_modified = (await self.session.execute(query)).one()
+        return count, max_id, last_modified
 
     async def add(self, data: BaseModel):
+        self._mark_dirty()
         try:
             add_stmt = (
                 insert(self.model).values(**data.model_dump()).returning(self.model)
@@ -69,15 +317,97 @@ class BaseRepository:
         except IntegrityError as exc:
             raise ObjectAlreadyExistsError from exc
 
-    async def add_bulk(self, data: list[BaseModel]) -> None | BaseModel:
+    @staticmethod
+    def max_rows_per_statement(columns_count: int) -> int:
+        """Сколько строк помещается в один INSERT при лимите параметров SQLite"""
+        return max(1, settings.DB_MAX_VARIABLES // max(1, columns_count))
+
+    async def get_existing_ids(self, ids) -> set[int]:
+        """Какие из переданных id есть в таблице"""
+        ids = list(set(ids))
+        existing = set()
+        chunk_size = settings.DB_MAX_VARIABLES
+        for start in range(0, len(ids), chunk_size):
+            query = select(self.model.id).where(
+                self.model.id.in_(ids[start : start + chunk_size])
+            )
+            existing.update((await self.session.execute(query)).scalars().all())
+        return existing
+
+    async def get_by_ids(
+        self, ids, schema: type[BaseModel] | None = None
+    ) -> list[BaseModel]:
+        """Записи по набору id: один запрос IN на каждые DB_MAX_VARIABLES id"""
+        schema = schema or self.schema
+        ids = sorted(set(ids))
+        rows = []
+        chunk_size = settings.DB_MAX_VARIABLES
+        for start in range(0, len(ids), chunk_size):
+            query = self._select(schema).where(
+                self.model.id.in_(ids[start : start + chunk_size])
+            )
+            rows += self._fetch_rows(schema, await self.session.execute(query))
+        return self._to_schemas(schema, rows)
+
+    async def get_latest_by(
+        self, key: str, values, limit: int, schema: type[BaseModel] | None = None
+    ) -> list[BaseModel]:
         """
-        Метод для множественного добавления данных в таблицу
+        Не больше limit последних (по id) записей на каждое значение колонки key,
+        одним запросом: значения приходят JSON-массивом (json_each), для каждого
+        коррелированный подзапрос берёт limit id по индексу (key, id).
+        ROW_NUMBER() OVER (PARTITION BY key) прочитал бы все строки ключа, а у
+        популярных проектов их сотни тысяч. Поля схемы - колонки таблицы
         """
-        add_stmt = insert(self.model).values([item.model_dump() for item in data])
+        schema = schema or self.schema
+        values = list(dict.fromkeys(values))
+        if not values:
+            return []
+        keys = func.json_each(json.dumps(values)).table_valued("key", "value").alias("keys")
+        inner = aliased(self.model)
+        latest = (
+            select(inner.id)
+            .where(getattr(inner, key) == keys.c.value)
+            .order_by(inner.id.desc())
+            .limit(limit)
+            .correlate(keys)
+        )
+        query = (
+            select(*self._schema_columns(schema))
+            .select_from(keys)
+            .join(self.model, self.model.id.in_(latest))
+            .order_by(keys.c.key, self.model.id.desc())
+        )
+        rows = (await self.session.execute(query)).mappings().all()
+        return list_adapter(schema).validate_python(rows)
+
+    async def add_bulk(self, data: list[BaseModel]) -> list[BaseModel]:
+        """
+        Метод для множественного добавления данных в таблицу.
+        Возвращает добавленные записи в том же порядке, что и data
+        """
+        self._mark_dirty()
+        rows = [item.model_dump() for item in data]
+        if not rows:
+            return []
+        # sort_by_parameter_order на SQLite выключает пакетную вставку (порядок
+        # RETURNING не гарантирован) - порядок восстанавливаем по первичному ключу,
+        # который растёт в порядке вставки
+        add_stmt = insert(self.model).returning(self.model)
+        # SQLAlchemy сам режет executemany на INSERT ... VALUES по page_size строк;
+        # берём столько строк, сколько помещается в лимит параметров SQLite
+        add_stmt = add_stmt.execution_options(
+            insertmanyvalues_page_size=self.max_rows_per_statement(len(rows[0]))
+        )
         # print(add_stmt.compile(compile_kwargs={"literal_binds": True}))
-        await self.session.execute(add_stmt)
+        result = await self.session.execute(add_stmt, rows)
+        return [
+            self.schema.model_validate(model, from_attributes=True)
+            for model in sorted(result.scalars().all(), key=lambda model: model.id)
+        ]
 
     async def delete(self, *filters, **filter_by) -> None:
+        self._mark_dirty()
         delete_stmt = delete(self.model)
         if filters:
             delete_stmt = delete_stmt.where(*filters)
@@ -85,14 +415,17 @@ class BaseRepository:
             delete_stmt = delete_stmt.filter_by(**filter_by)
 
         await self.session.execute(delete_stmt)
-        await self.session.commit()
 
     async def edit(
         self, data: BaseModel, exclude_unset: bool = False, **filter_by
     ) -> None:
+        self._mark_dirty()
         edit_stmt = (
             update(self.model)
             .filter_by(**filter_by)
             .values(**data.model_dump(exclude_unset=exclude_unset))
         )
         await self.session.execute(edit_stmt)
+
+
+_track_methods(BaseRepository)
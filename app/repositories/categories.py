@@ -0,0 +1,9 @@
+from app.models.categories import CategoriesModel
+from app.repositories.base import BaseRepository
+from app.schemes.categories import SCategoriesGet
+
+
+class CategoriesRepository(BaseRepository):
+    model = CategoriesModel
+    schema = SCategoriesGet
+    cache_enabled = True
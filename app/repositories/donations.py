@@ -0,0 +1,52 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models.donations import DonationModel
+from app.repositories.base import BaseRepository
+from app.schemes.donations import SDonationGet
+from app.utils.pagination import seek_value
+
+
+class DonationsRepository(BaseRepository):
+    model = DonationModel
+    schema = SDonationGet
+    sort_keys = ("id", "created_at")
+
+    async def stream_export(
+        self,
+        batch_size: int,
+        project_id: int | None = None,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> AsyncIterator[list]:
+        """
+        Потоково отдаёт пожертвования в порядке id пачками по batch_size строк
+        (session.stream + yield_per): в памяти одновременно только одна пачка.
+        Период полуоткрытый: date_from <= created_at < date_to
+        """
+        query = (
+            select(
+                self.model.id,
+                self.model.project_id,
+                self.model.user_id,
+                self.model.amount,
+                self.model.created_at,
+            )
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if project_id is not None:
+            query = query.where(self.model.project_id == project_id)
+        if user_id is not None:
+            query = query.where(self.model.user_id == user_id)
+        if date_from is not None:
+            query = query.where(self.model.created_at >= seek_value(date_from))
+        if date_to is not None:
+            query = query.where(self.model.created_at < seek_value(date_to))
+
+        result = await self.session.stream(query)
+        async for rows in result.partitions():
+            yield rows
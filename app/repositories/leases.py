@@ -0,0 +1,37 @@
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.leases import LeaseModel
+from app.repositories.base import BaseRepository
+from app.schemes.leases import SLeaseGet
+
+
+class LeasesRepository(BaseRepository):
+    model = LeaseModel
+    schema = SLeaseGet
+
+    async def acquire(self, name: str, owner: str, now: int, ttl: int) -> bool:
+        """
+        Берёт или продлевает аренду одним UPSERT: строка переходит к owner,
+        только если она уже его или чужая аренда истекла. True - аренда у owner
+        """
+        self._mark_dirty()
+        stmt = sqlite_insert(self.model).values(name=name, owner=owner, expires_at=now + ttl)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.name],
+            set_={
+                "owner": stmt.excluded.owner,
+                "expires_at": stmt.excluded.expires_at,
+                "updated_at": func.now(),
+            },
+            where=(self.model.owner == owner) | (self.model.expires_at <= now),
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount == 1
+
+    async def release(self, name: str, owner: str) -> None:
+        """Отдаёт аренду сразу, не дожидаясь её истечения"""
+        self._mark_dirty()
+        await self.session.execute(
+            delete(self.model).where(self.model.name == name, self.model.owner == owner)
+        )
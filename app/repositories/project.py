@@ -1,11 +1,179 @@
-from sqlalchemy import select
+from sqlalchemy import column, func, literal_column, select, table, tuple_, update
 from sqlalchemy.orm import selectinload
 
+from app.exceptions.pagination import InvalidCursorError
+
+from app.models.donations import DonationModel
 from app.models.project import ProjectModel
+from app.models.project_stats import ProjectStatsModel
+from app.models.refunds import RefundCheckpointModel
 from app.repositories.base import BaseRepository
-from app.schemes.projects import SProjectGet
+from app.schemes.projects import SProjectGet, SProjectSearchResult, SProjectStatsGet
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.search import SNIPPET_END, SNIPPET_START, build_match_query, highlight_snippet
+from app.utils.serialization import list_adapter
+
+# Виртуальная таблица FTS5 (миграция 9c41d2e7a8f0), синхронизируется триггерами
+projects_fts = table("projects_fts", column("rowid"), column("rank"))
 
 
 class ProjectsRepository(BaseRepository):
     model = ProjectModel
-    schema = SProjectGet
\ No newline at end of file
+    schema = SProjectGet
+    sort_keys = ("id", "date_end")
+    cache_enabled = True
+
+    async def get_stats(self, project_id: int) -> SProjectStatsGet | None:
+        """Агрегаты пожертвований проекта из project_stats, без обхода donations"""
+        query = select(ProjectStatsModel).where(ProjectStatsModel.project_id == project_id)
+        result = await self.session.execute(query)
+
+        model = result.scalars().one_or_none()
+        if model is None:
+            return None
+        return SProjectStatsGet.model_validate(model, from_attributes=True)
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        category_id: int | None = None,
+        is_active: bool | None = None,
+    ) -> tuple[list[SProjectSearchResult], str | None]:
+        """
+        Полнотекстовый поиск по названию и описанию. Порядок - bm25 (rank FTS5),
+        курсорная пагинация по паре (rank, id)
+        """
+        fts = literal_column("projects_fts")
+        rank = projects_fts.c.rank
+        stmt = (
+            select(
+                *self._schema_columns(self.schema),
+                rank.label("rank"),
+                func.snippet(fts, -1, SNIPPET_START, SNIPPET_END, "…", 16).label("snippet"),
+            )
+            .select_from(projects_fts)
+            .join(self.model, self.model.id == projects_fts.c.rowid)
+            .where(fts.op("MATCH")(build_match_query(query)))
+        )
+        if category_id is not None:
+            stmt = stmt.where(self.model.category_id == category_id)
+        if is_active is not None:
+            stmt = stmt.where(self.model.is_active == is_active)
+
+        if cursor is not None:
+            cursor_key, value, last_id = decode_cursor(cursor)
+            if cursor_key != "rank" or not isinstance(value, (int, float)):
+                raise InvalidCursorError
+            stmt = stmt.where(tuple_(rank, projects_fts.c.rowid) > tuple_(value, last_id))
+
+        stmt = stmt.order_by(rank, projects_fts.c.rowid).limit(limit + 1)
+        rows = (await self.session.execute(stmt)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("rank", rows[-1]["rank"], rows[-1]["id"])
+        rows = [{**row, "snippet": highlight_snippet(row["snippet"])} for row in rows]
+        return list_adapter(SProjectSearchResult).validate_python(rows), next_cursor
+
+    async def add_to_collected(self, project_id: int, amount: int) -> None:
+        """Атомарно увеличивает собранную сумму проекта (UPDATE ... SET x = x + :amount)"""
+        self._mark_dirty()
+        stmt = (
+            update(self.model)
+            .where(self.model.id == project_id)
+            .values(collected_amount=self.model.collected_amount + amount)
+        )
+        await self.session.execute(stmt)
+
+    async def reconcile_collected(self, after_id: int, limit: int) -> tuple[int | None, int]:
+        """
+        Пересчитывает собранные суммы по таблице donations для следующей пачки
+        проектов с id > after_id. Возвращает последний обработанный id
+        (None, если проектов больше нет) и число исправленных проектов
+        """
+        ids_query = (
+            select(self.model.id)
+            .where(self.model.id > after_id)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        ids = (await self.session.execute(ids_query)).scalars().all()
+        if not ids:
+            return None, 0
+
+        actual = (
+            select(func.coalesce(func.sum(DonationModel.amount), 0))
+            .where(DonationModel.project_id == self.model.id)
+            .scalar_subquery()
+        )
+        self._mark_dirty()
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.id.between(ids[0], ids[-1]),
+                self.model.collected_amount != actual,
+            )
+            .values(collected_amount=actual)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return ids[-1], result.rowcount
+
+    async def get_upcoming_deadlines(self, after: int, limit: int) -> list[int]:
+        """Ближайшие date_end активных проектов позже after, по возрастанию, без повторов"""
+        query = (
+            select(self.model.date_end)
+            .where(self.model.is_active.is_(True), self.model.date_end > after)
+            .group_by(self.model.date_end)
+            .order_by(self.model.date_end)
+            .limit(limit)
+        )
+        return list((await self.session.execute(query)).scalars().all())
+
+    async def deactivate_expired(self, now: int, limit: int) -> int:
+        """
+        Закрывает не больше limit активных проектов с date_end <= now
+        (поиск по ix_projects_is_active_date_end). Возвращает число закрытых
+        """
+        self._mark_dirty()
+        expired = (
+            select(self.model.id)
+            .where(self.model.is_active.is_(True), self.model.date_end <= now)
+            .limit(limit)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(expired.scalar_subquery()))
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def get_failed_ids(self, now: int, after_id: int, limit: int) -> list[int]:
+        """
+        id проектов с id > after_id, у которых date_end <= now, а цель не собрана,
+        и есть пожертвования после отметки возвратов (в том числе пришедшие уже
+        после завершения возвратов). По возрастанию id, не больше limit
+        """
+        checkpoint = RefundCheckpointModel
+        not_refunded = select(DonationModel.id).where(
+            DonationModel.project_id == self.model.id,
+            DonationModel.id > func.coalesce(checkpoint.last_donation_id, 0),
+        )
+        query = (
+            select(self.model.id)
+            .outerjoin(checkpoint, checkpoint.project_id == self.model.id)
+            .where(
+                self.model.id > after_id,
+                self.model.date_end <= now,
+                self.model.collected_amount < self.model.target_amount,
+                not_refunded.exists(),
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        return list((await self.session.execute(query)).scalars().all())
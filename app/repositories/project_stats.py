@@ -0,0 +1,166 @@
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.donations import DonationModel
+from app.models.project import ProjectModel
+from app.models.project_stats import ProjectStatsModel
+from app.repositories.base import BaseRepository
+from app.schemes.donations import SDonationGet
+from app.schemes.projects import SProjectStatsGet
+
+
+class ProjectStatsRepository(BaseRepository):
+    """
+    Таблица project_stats. Методы apply_donations/revert_donation вызываются
+    в той же транзакции, что и изменение таблицы donations
+    """
+
+    model = ProjectStatsModel
+    schema = SProjectStatsGet
+
+    async def apply_donations(self, donations: list[SDonationGet]) -> None:
+        """Учитывает уже добавленные пожертвования в агрегатах их проектов"""
+        self._mark_dirty()
+        by_project: dict[int, list[SDonationGet]] = {}
+        for donation in donations:
+            by_project.setdefault(donation.project_id, []).append(donation)
+
+        for project_id, project_donations in by_project.items():
+            user_ids = {donation.user_id for donation in project_donations}
+            # Донор новый, если у него нет других пожертвований этому проекту
+            known_donors_query = select(DonationModel.user_id.distinct()).where(
+                DonationModel.project_id == project_id,
+                DonationModel.user_id.in_(user_ids),
+                DonationModel.id.not_in([donation.id for donation in project_donations]),
+            )
+            known_donors = (await self.session.execute(known_donors_query)).scalars().all()
+            # Время самих пожертвований, а не момент записи: правка старого
+            # пожертвования или импорт не должны сдвигать его вперёд (как в rebuild)
+            last_donation_at = (
+                select(func.max(DonationModel.created_at))
+                .where(DonationModel.id.in_([donation.id for donation in project_donations]))
+                .scalar_subquery()
+            )
+
+            upsert_stmt = sqlite_insert(self.model).values(
+                project_id=project_id,
+                total_amount=sum(donation.amount for donation in project_donations),
+                donations_count=len(project_donations),
+                donors_count=len(user_ids - set(known_donors)),
+                max_donation=max(donation.amount for donation in project_donations),
+                last_donation_at=last_donation_at,
+            )
+            upsert_stmt = upsert_stmt.on_conflict_do_update(
+                index_elements=[self.model.project_id],
+                set_={
+                    "total_amount": self.model.total_amount + upsert_stmt.excluded.total_amount,
+                    "donations_count": self.model.donations_count
+                    + upsert_stmt.excluded.donations_count,
+                    "donors_count": self.model.donors_count + upsert_stmt.excluded.donors_count,
+                    "max_donation": func.max(
+                        self.model.max_donation, upsert_stmt.excluded.max_donation
+                    ),
+                    "last_donation_at": func.max(
+                        func.coalesce(
+                            self.model.last_donation_at, upsert_stmt.excluded.last_donation_at
+                        ),
+                        upsert_stmt.excluded.last_donation_at,
+                    ),
+                    "updated_at": func.now(),
+                },
+            )
+            await self.session.execute(upsert_stmt)
+
+    async def revert_donation(self, donation: SDonationGet) -> None:
+        """
+        Убирает пожертвование из агрегатов проекта. Вызывается после того,
+        как строка удалена или изменена в таблице donations
+        """
+        self._mark_dirty()
+        project_id = donation.project_id
+        other_donation_exists = (
+            select(DonationModel.id)
+            .where(
+                DonationModel.project_id == project_id,
+                DonationModel.user_id == donation.user_id,
+                DonationModel.id != donation.id,
+            )
+            .limit(1)
+        )
+        has_other_donation = (
+            await self.session.execute(other_donation_exists)
+        ).first() is not None
+
+        max_amount = (
+            select(func.coalesce(func.max(DonationModel.amount), 0))
+            .where(DonationModel.project_id == project_id)
+            .scalar_subquery()
+        )
+        last_donation_at = (
+            select(DonationModel.created_at)
+            .where(DonationModel.project_id == project_id)
+            .order_by(DonationModel.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        values = {
+            "total_amount": self.model.total_amount - donation.amount,
+            "donations_count": self.model.donations_count - 1,
+            "last_donation_at": last_donation_at,
+        }
+        if not has_other_donation:
+            values["donors_count"] = self.model.donors_count - 1
+        # Максимум пересчитываем по индексу, только если убрали максимальное пожертвование
+        values["max_donation"] = case(
+            (self.model.max_donation > donation.amount, self.model.max_donation),
+            else_=max_amount,
+        )
+
+        stmt = update(self.model).where(self.model.project_id == project_id).values(**values)
+        await self.session.execute(stmt)
+
+    async def rebuild(self, after_id: int, limit: int) -> int | None:
+        """
+        Пересчитывает с нуля агрегаты следующей пачки проектов с id > after_id.
+        Возвращает последний обработанный id (None, если проектов больше нет)
+        """
+        ids_query = (
+            select(ProjectModel.id)
+            .where(ProjectModel.id > after_id)
+            .order_by(ProjectModel.id)
+            .limit(limit)
+        )
+        ids = (await self.session.execute(ids_query)).scalars().all()
+        if not ids:
+            return None
+
+        self._mark_dirty()
+        await self.session.execute(
+            delete(self.model).where(self.model.project_id.between(ids[0], ids[-1]))
+        )
+        aggregates = (
+            select(
+                DonationModel.project_id,
+                func.sum(DonationModel.amount),
+                func.count(),
+                func.count(DonationModel.user_id.distinct()),
+                func.max(DonationModel.amount),
+                func.max(DonationModel.created_at),
+            )
+            .where(DonationModel.project_id.between(ids[0], ids[-1]))
+            .group_by(DonationModel.project_id)
+        )
+        await self.session.execute(
+            insert(self.model).from_select(
+                [
+                    "project_id",
+                    "total_amount",
+                    "donations_count",
+                    "donors_count",
+                    "max_donation",
+                    "last_donation_at",
+                ],
+                aggregates,
+            )
+        )
+        return ids[-1]
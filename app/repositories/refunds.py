@@ -0,0 +1,89 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.donations import DonationModel
+from app.models.refunds import RefundCheckpointModel, RefundModel
+from app.repositories.base import BaseRepository
+from app.schemes.refunds import SRefundCheckpointGet, SRefundGet
+
+
+class RefundsRepository(BaseRepository):
+    model = RefundModel
+    schema = SRefundGet
+
+    async def refund_chunk(
+        self, project_id: int, after_id: int, limit: int
+    ) -> tuple[int | None, int, int, int]:
+        """
+        Пишет возвраты следующих limit пожертвований проекта с id > after_id
+        (поиск по ix_donations_project_id_id). Пожертвования, по которым возврат
+        уже есть, пропускаются. Возвращает последний id пачки (None - пожертвований
+        больше нет), число прочитанных пожертвований, число и сумму новых возвратов
+        """
+        self._mark_dirty()
+        query = (
+            select(DonationModel.id, DonationModel.user_id, DonationModel.amount)
+            .where(DonationModel.project_id == project_id, DonationModel.id > after_id)
+            .order_by(DonationModel.id)
+            .limit(limit)
+        )
+        donations = (await self.session.execute(query)).all()
+        if not donations:
+            return None, 0, 0, 0
+
+        stmt = (
+            sqlite_insert(self.model)
+            .on_conflict_do_nothing(index_elements=[self.model.donation_id])
+            .returning(self.model.amount)
+            .execution_options(insertmanyvalues_page_size=self.max_rows_per_statement(4))
+        )
+        result = await self.session.execute(
+            stmt,
+            [
+                {
+                    "donation_id": donation.id,
+                    "project_id": project_id,
+                    "user_id": donation.user_id,
+                    "amount": donation.amount,
+                }
+                for donation in donations
+            ],
+        )
+        amounts = result.scalars().all()
+        return donations[-1].id, len(donations), len(amounts), sum(amounts)
+
+
+class RefundCheckpointsRepository(BaseRepository):
+    """Прогресс возвратов; меняется в той же транзакции, что и пачка возвратов"""
+
+    model = RefundCheckpointModel
+    schema = SRefundCheckpointGet
+
+    async def advance(
+        self,
+        project_id: int,
+        last_donation_id: int,
+        refunds_count: int,
+        refunds_amount: int,
+        completed: bool,
+    ) -> None:
+        self._mark_dirty()
+        completed_at = func.now() if completed else None
+        stmt = sqlite_insert(self.model).values(
+            project_id=project_id,
+            last_donation_id=last_donation_id,
+            refunds_count=refunds_count,
+            refunds_amount=refunds_amount,
+            completed_at=completed_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.project_id],
+            set_={
+                "last_donation_id": stmt.excluded.last_donation_id,
+                "refunds_count": self.model.refunds_count + stmt.excluded.refunds_count,
+                "refunds_amount": self.model.refunds_amount + stmt.excluded.refunds_amount,
+                "completed_at": stmt.excluded.completed_at,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class SBulkImportError(BaseModel):
+    row: int
+    error: str
+
+
+class SBulkImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    # Не больше BULK_IMPORT_MAX_ERRORS записей, failed считает все ошибки
+    errors: list[SBulkImportError] = []
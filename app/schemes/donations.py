@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 class SDonationAdd(BaseModel):
     project_id: int
     user_id: int
+    # В копейках
     amount: int
 
 
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class SLeaseGet(BaseModel):
+    name: str
+    owner: str
+    expires_at: int
@@ -1,19 +1,17 @@
-from typing import TYPE_CHECKING
+from datetime import datetime
 from pydantic import BaseModel
 
-if TYPE_CHECKING:
-    from app.schemes.users import SUserGet
-    from app.schemes.categories import SCategoriesGet
-    from app.schemes.donations import SDonationGet
-    from app.schemes.rewards import SRewardGet
+from app.schemes.categories import SCategoriesGet
+from app.schemes.donations import SDonationGet
+from app.schemes.rewards import SRewardGet
+from app.schemes.users import SUserPublic
 
 
 class SProjectAdd(BaseModel):
     creator_id: int
     title: str
     description: str
-    target_amount: str
-    collected_amount: str
+    target_amount: int
     category_id: int
     date_start: int
     date_end: int
@@ -23,8 +21,7 @@ class SProjectAdd(BaseModel):
 class SProjectUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
-    target_amount: str | None = None
-    collected_amount: str | None = None
+    target_amount: int | None = None
     category_id: int | None = None
     date_start: int | None = None
     date_end: int | None = None
@@ -33,10 +30,26 @@ class SProjectUpdate(BaseModel):
 
 class SProjectGet(SProjectAdd):
     id: int
+    collected_amount: int
+
+
+class SProjectSearchResult(SProjectGet):
+    rank: float
+    snippet: str
+
+
+class SProjectStatsGet(BaseModel):
+    project_id: int
+    total_amount: int = 0
+    donations_count: int = 0
+    donors_count: int = 0
+    max_donation: int = 0
+    last_donation_at: datetime | None = None
 
 
 class SProjectsWithRelations(SProjectGet):
-    creator: "SUserGet"
-    category: "SCategoriesGet"
-    donations: list["SDonationGet"] | None = None
-    rewards: list["SRewardGet"] | None = None
+    """Связи для include=; donations и rewards - последние записи (см. PROJECT_INCLUDE_*)"""
+    creator: SUserPublic
+    category: SCategoriesGet
+    donations: list[SDonationGet]
+    rewards: list[SRewardGet]
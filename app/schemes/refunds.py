@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SRefundAdd(BaseModel):
+    donation_id: int
+    project_id: int
+    user_id: int
+    amount: int
+
+
+class SRefundGet(SRefundAdd):
+    id: int
+
+
+class SRefundCheckpointGet(BaseModel):
+    project_id: int
+    last_donation_id: int = 0
+    refunds_count: int = 0
+    refunds_amount: int = 0
+    completed_at: datetime | None = None
@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 
 class SRewardAdd(BaseModel):
+    project_id: int | None = None
     title: str | None = None
     description: str | None = None
     required_quantity: int | None = None
@@ -28,6 +28,12 @@ class SUserGet(SUserAdd):
     id: int
 
 
+class SUserPublic(BaseModel):
+    """Пользователь во вложенных ответах (создатель проекта): без email и пароля"""
+    id: int
+    name: str
+
+
 class SUserPatch(BaseModel):
     name: str | None = None
     email: EmailStr | None = None
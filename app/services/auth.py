@@ -13,23 +13,27 @@ from app.schemes.users import (
     SUserAdd,
     SUserAddRequest,
     SUserAuth,
+    SUserPatch,
 )
 from app.schemes.relations_users_roles import SUserGetWithRels
 from app.services.base import BaseService
+from app.services.passwords import password_hasher
+from app.services.principals import principal_cache
 import jwt
-from passlib.context import CryptContext
 
 
 class AuthService(BaseService):
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = password_hasher.context
 
     @classmethod
     def create_access_token(cls, data: dict) -> str:
         to_encode = data.copy()
-        expire: datetime = datetime.now(timezone.utc) + timedelta(
+        issued_at = datetime.now(timezone.utc)
+        expire: datetime = issued_at + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        to_encode |= {"exp": expire}
+        # iat сверяется с моментом последнего изменения ролей в PrincipalCache
+        to_encode |= {"exp": expire, "iat": issued_at}
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, settings.ALGORITHM)
         return encoded_jwt
 
@@ -52,24 +56,38 @@ class AuthService(BaseService):
 
     async def register_user(self, user_data: SUserAddRequest):
         try:
-            hashed_password: str = self.hash_password(user_data.password)
+            hashed_password: str = await password_hasher.hash(user_data.password)
             new_user_data = SUserAdd(
                 email=user_data.email,
                 hashed_password=hashed_password,
                 name=user_data.name,
                 
             )
-            await self.db.users.add(new_user_data)
+            user = await self.db.users.add(new_user_data)
         except ObjectAlreadyExistsError:
             raise UserAlreadyExistsError
         await self.db.commit()
+        # id удалённого пользователя мог достаться новому, а в кэше лежит "не найден"
+        principal_cache.invalidate_user(user.id)
 
     async def login_user(self, user_data: SUserAuth):
         user = await self.db.users.get_one_or_none_with_role(email=user_data.email)
         if not user:
             raise UserNotFoundError
-        if not self.verify_password(user_data.password, user.hashed_password):
+        # Не держим соединение записи, пока bcrypt проверяет пароль
+        await self.db.rollback()
+        is_valid, new_hash = await password_hasher.verify_and_update(
+            user_data.password, user.hashed_password
+        )
+        if not is_valid:
             raise InvalidPasswordError
+        if new_hash is not None:
+            # Хэш создан с прежним BCRYPT_ROUNDS - пересохраняем с текущим
+            await self.db.users.edit(
+                SUserPatch(hashed_password=new_hash), exclude_unset=True, id=user.id
+            )
+            await self.db.commit()
+            principal_cache.invalidate_user(user.id)
         access_token: str = self.create_access_token(
             {
                 "user_id": user.id,
@@ -79,9 +97,7 @@ class AuthService(BaseService):
         return access_token
 
     async def get_me(self, user_id: int):
-        user: SUserGetWithRels | None = await self.db.users.get_one_or_none_with_role(
-            id=user_id
-        )
+        user: SUserGetWithRels | None = await principal_cache.get_user(user_id)
         if not user:
             raise UserNotFoundError
         return user
@@ -0,0 +1,124 @@
+from collections.abc import AsyncIterator
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.repositories.base import BaseRepository
+from app.schemes.bulk import SBulkImportError, SBulkImportReport
+from app.schemes.donations import SDonationAdd
+from app.schemes.projects import SProjectAdd
+from app.schemes.rewards import SRewardAdd
+from app.services.base import BaseService
+from app.services.deadline_sweeper import deadline_sweeper
+from app.services.donations import DonationsService
+from app.utils.bulk import BulkRecord
+
+# Схема строки и внешние ключи (поле -> репозиторий DBManager), проверяемые перед вставкой
+IMPORT_TARGETS: dict[str, tuple[type[BaseModel], dict[str, str]]] = {
+    "projects": (SProjectAdd, {"creator_id": "users", "category_id": "categories"}),
+    "donations": (SDonationAdd, {"project_id": "projects", "user_id": "users"}),
+    "rewards": (SRewardAdd, {"project_id": "projects"}),
+}
+
+
+def _validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class BulkImportService(BaseService):
+    """
+    Массовая загрузка строк из NDJSON/CSV.
+
+    Строки копятся пачками по BULK_IMPORT_BATCH_SIZE (не больше, чем
+    помещается в один INSERT), каждая пачка проверяется и вставляется в своей
+    транзакции. Если пачка не вставилась, её строки вставляются по одной,
+    чтобы ошибку получила только виновная строка.
+    """
+
+    async def import_records(
+        self, target: str, records: AsyncIterator[BulkRecord]
+    ) -> SBulkImportReport:
+        schema, _ = IMPORT_TARGETS[target]
+        batch_size = min(
+            settings.BULK_IMPORT_BATCH_SIZE,
+            BaseRepository.max_rows_per_statement(len(schema.model_fields)),
+        )
+        report = SBulkImportReport()
+        batch: list[tuple[int, dict]] = []
+        async for row, record, error in records:
+            report.total += 1
+            if error is not None:
+                self._add_error(report, row, error)
+                continue
+            batch.append((row, record))
+            if len(batch) >= batch_size:
+                await self._import_batch(target, batch, report)
+                batch = []
+        if batch:
+            await self._import_batch(target, batch, report)
+        report.errors.sort(key=lambda error: error.row)
+        return report
+
+    def _add_error(self, report: SBulkImportReport, row: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < settings.BULK_IMPORT_MAX_ERRORS:
+            report.errors.append(SBulkImportError(row=row, error=error))
+
+    async def _import_batch(
+        self, target: str, batch: list[tuple[int, dict]], report: SBulkImportReport
+    ) -> None:
+        schema, references = IMPORT_TARGETS[target]
+        items: list[tuple[int, BaseModel]] = []
+        for row, record in batch:
+            try:
+                items.append((row, schema.model_validate(record)))
+            except ValidationError as exc:
+                self._add_error(report, row, _validation_error(exc))
+
+        for field, repository_name in references.items():
+            repository = getattr(self.db, repository_name)
+            # None проходит: ссылка необязательная (rewards.project_id)
+            existing = await repository.get_existing_ids(
+                value for _, item in items if (value := getattr(item, field)) is not None
+            )
+            valid = []
+            for row, item in items:
+                value = getattr(item, field)
+                if value is None or value in existing:
+                    valid.append((row, item))
+                else:
+                    self._add_error(report, row, f"{field}: запись не найдена")
+            items = valid
+        if not items:
+            await self.db.rollback()
+            return
+
+        try:
+            await self._insert(target, [item for _, item in items])
+            await self.db.commit()
+            report.inserted += len(items)
+            return
+        except SQLAlchemyError:
+            await self.db.rollback()
+
+        for row, item in items:
+            try:
+                await self._insert(target, [item])
+                await self.db.commit()
+                report.inserted += 1
+            except SQLAlchemyError as exc:
+                await self.db.rollback()
+                self._add_error(report, row, str(getattr(exc, "orig", exc)))
+
+    async def _insert(self, target: str, items: list[BaseModel]) -> None:
+        if target == "donations":
+            # Пожертвования вставляются вместе со счётчиками проектов и project_stats
+            await DonationsService(self.db).add_donations_bulk(items)
+        else:
+            await getattr(self.db, target).add_bulk(items)
+        if target == "projects":
+            deadline_sweeper.schedule(min(item.date_end for item in items))
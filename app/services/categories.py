@@ -0,0 +1,41 @@
+from app.schemes.categories import SCategoriesAdd, SCategoriesUpdate
+from app.services.base import BaseService
+
+
+class CategoriesService(BaseService):
+    async def get_categories(self, offset: int, limit: int):
+        return await self.db.categories.get_filtered(offset=offset, limit=limit)
+
+    async def get_categories_version(self):
+        return await self.db.categories.get_version()
+
+    async def get_category_version(self, category_id: int):
+        return await self.db.categories.get_version(id=category_id)
+
+    async def get_category(self, category_id: int):
+        return await self.db.categories.get_one_or_none(id=category_id)
+
+    async def create_category(self, category_data: SCategoriesAdd):
+        category = await self.db.categories.add(category_data)
+        await self.db.commit()
+
+        return category
+
+    async def update_category(self, category_id: int, category_data: SCategoriesUpdate):
+        category = await self.db.categories.get_one_or_none(id=category_id)
+        if category is None:
+            return None
+        await self.db.categories.edit(category_data, exclude_unset=True, id=category_id)
+        category = await self.db.categories.get_one_or_none(id=category_id)
+        await self.db.commit()
+
+        return category
+
+    async def delete_category(self, category_id: int):
+        category = await self.db.categories.get_one_or_none(id=category_id)
+        if category is None:
+            return None
+        await self.db.categories.delete(id=category_id)
+        await self.db.commit()
+
+        return category
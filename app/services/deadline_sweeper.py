@@ -0,0 +1,165 @@
+import asyncio
+import heapq
+import logging
+import os
+import socket
+import time
+import uuid
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "deadline_sweeper"
+
+
+class DeadlineSweeper:
+    """
+    Фоновое закрытие проектов, у которых прошёл date_end.
+
+    В памяти - min-куча ближайших дедлайнов (не больше heap_size, перечитывается
+    из БД, когда опустеет или раз в max_sleep секунд). Задача спит до ближайшего
+    дедлайна и закрывает истёкшие проекты пачками по batch_size, каждая пачка
+    в своей транзакции. При нескольких воркерах работает только держатель
+    аренды в таблице leases; остальные раз в lease_ttl / 2 пробуют её взять.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int,
+        heap_size: int,
+        max_sleep: float,
+        lease_ttl: int,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.heap_size = heap_size
+        self.max_sleep = max_sleep
+        self.lease_ttl = lease_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.deadlines: list[int] = []
+        self._refreshed_at = 0.0
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.is_leader = False
+        self.sweeps = 0
+        self.closed = 0
+        self.errors = 0
+        self.last_sweep_at: int | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    async def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает задачу и сразу отдаёт аренду другому воркеру"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self.is_leader:
+            async with DBManager(session_factory=self.session_factory) as db:
+                await db.leases.release(LEASE_NAME, self.owner)
+                await db.commit()
+            self.is_leader = False
+
+    def schedule(self, date_end: int) -> None:
+        """
+        Сообщает о дедлайне нового или изменённого проекта. Если он раньше
+        всех известных - задача просыпается и пересчитывает время сна
+        """
+        if not self.is_running:
+            return
+        if not self.deadlines or date_end < self.deadlines[0]:
+            heapq.heappush(self.deadlines, date_end)
+            self._wakeup.set()
+        elif len(self.deadlines) < self.heap_size:
+            heapq.heappush(self.deadlines, date_end)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                self.is_leader = await self._acquire_lease()
+                timeout = self.lease_ttl / 2
+                if self.is_leader:
+                    await self._sweep()
+                    if self.deadlines:
+                        # Запас, чтобы не проснуться за доли секунды до дедлайна и не крутиться
+                        wait = self.deadlines[0] + 0.1 - time.time()
+                        timeout = min(timeout, max(0.0, wait))
+            except Exception:
+                logger.exception("Ошибка закрытия просроченных проектов")
+                self.errors += 1
+                timeout = self.lease_ttl / 2
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _acquire_lease(self) -> bool:
+        async with DBManager(session_factory=self.session_factory) as db:
+            acquired = await db.leases.acquire(
+                LEASE_NAME, self.owner, now=int(time.time()), ttl=self.lease_ttl
+            )
+            await db.commit()
+        return acquired
+
+    async def _sweep(self) -> None:
+        now = int(time.time())
+        # При перечитывании проходим и по БД: проекты из других воркеров могли уже истечь
+        refresh = not self.deadlines or time.monotonic() - self._refreshed_at >= self.max_sleep
+        if refresh or self.deadlines[0] <= now:
+            while True:
+                async with DBManager(session_factory=self.session_factory) as db:
+                    closed = await db.projects.deactivate_expired(now=now, limit=self.batch_size)
+                    await db.commit()
+                self.closed += closed
+                if closed < self.batch_size:
+                    break
+            self.sweeps += 1
+            self.last_sweep_at = now
+        while self.deadlines and self.deadlines[0] <= now:
+            heapq.heappop(self.deadlines)
+
+        if refresh or not self.deadlines:
+            async with DBManager(session_factory=self.session_factory) as db:
+                # Список уже отсортирован по возрастанию - это готовая куча
+                self.deadlines = await db.projects.get_upcoming_deadlines(
+                    after=now, limit=self.heap_size
+                )
+            self._refreshed_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.is_running,
+            "owner": self.owner,
+            "is_leader": self.is_leader,
+            "next_deadline": self.deadlines[0] if self.deadlines else None,
+            "known_deadlines": len(self.deadlines),
+            "sweeps": self.sweeps,
+            "closed": self.closed,
+            "errors": self.errors,
+            "last_sweep_at": self.last_sweep_at,
+        }
+
+
+deadline_sweeper = DeadlineSweeper(
+    session_factory=async_session_maker,
+    batch_size=settings.DEADLINE_SWEEPER_BATCH_SIZE,
+    heap_size=settings.DEADLINE_SWEEPER_HEAP_SIZE,
+    max_sleep=settings.DEADLINE_SWEEPER_MAX_SLEEP,
+    lease_ttl=settings.DEADLINE_SWEEPER_LEASE_TTL,
+)
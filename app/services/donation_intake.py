@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.database.database import async_session_maker
+from app.database.db_manager import DBManager
+from app.exceptions.donations import DonationIntakeOverloadedError
+from app.schemes.donations import SDonationAdd, SDonationGet
+from app.services.donations import DonationsService
+
+
+class DonationIntake:
+    """
+    Групповая запись пожертвований.
+
+    Запросы кладут провалидированные пожертвования в очередь, единственная
+    фоновая задача-писатель сбрасывает их пачками через add_bulk: каждые
+    batch_size записей или max_delay_ms миллисекунд. Каждый вызывающий
+    получает свою запись (с id) или свою ошибку.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int,
+        max_delay_ms: int,
+        max_queue: int,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.max_queue = max_queue
+        self.queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.batches = 0
+        self.donations = 0
+        self.failed_batches = 0
+        self.total_flush_ms = 0.0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return (
+            self._writer_task is not None
+            and not self._writer_task.done()
+            and not self._stopping
+        )
+
+    async def start(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self._stopping = False
+        self._writer_task = asyncio.create_task(self._writer())
+
+    async def stop(self) -> None:
+        """Останавливает писателя, дописав всё, что уже стоит в очереди"""
+        if self._writer_task is None:
+            return
+        self._stopping = True
+        await self.queue.put(None)
+        await self._writer_task
+        self._writer_task = None
+
+    async def submit(self, donation_data: SDonationAdd) -> SDonationGet:
+        """Ставит пожертвование в очередь и ждёт, пока его пачка будет записана"""
+        if not self.is_running:
+            raise DonationIntakeOverloadedError
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((donation_data, future))
+        except asyncio.QueueFull:
+            raise DonationIntakeOverloadedError
+        return await future
+
+    async def _writer(self) -> None:
+        # None в очереди - сигнал остановки от stop()
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    item = self.queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list[tuple[SDonationAdd, asyncio.Future]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with DBManager(session_factory=self.session_factory) as db:
+                donations = await DonationsService(db).create_donations_bulk(
+                    [donation_data for donation_data, _ in batch]
+                )
+            for (_, future), donation in zip(batch, donations):
+                if not future.done():
+                    future.set_result(donation)
+        except Exception:
+            # Пачка откатилась целиком: пишем по одной, чтобы ошибку получил
+            # только тот, чьё пожертвование её вызвало
+            self.failed_batches += 1
+            for donation_data, future in batch:
+                try:
+                    async with DBManager(session_factory=self.session_factory) as db:
+                        donation = await DonationsService(db).create_donation(
+                            donation_data
+                        )
+                except Exception as exc:
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(donation)
+
+        flush_ms = (time.perf_counter() - started) * 1000
+        self.batches += 1
+        self.donations += len(batch)
+        self.total_flush_ms += flush_ms
+        self.last_flush_ms = flush_ms
+        self.max_flush_ms = max(self.max_flush_ms, flush_ms)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.is_running,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue": self.max_queue,
+            "batch_size": self.batch_size,
+            "max_delay_ms": self.max_delay * 1000,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "donations": self.donations,
+            "avg_batch_size": self.donations / self.batches if self.batches else 0,
+            "avg_flush_ms": self.total_flush_ms / self.batches if self.batches else 0,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+        }
+
+
+donation_intake = DonationIntake(
+    session_factory=async_session_maker,
+    batch_size=settings.DONATION_INTAKE_BATCH_SIZE,
+    max_delay_ms=settings.DONATION_INTAKE_MAX_DELAY_MS,
+    max_queue=settings.DONATION_INTAKE_MAX_QUEUE,
+)
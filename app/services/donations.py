@@ -0,0 +1,190 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.exceptions.donations import InvalidExportPeriodError
+from app.schemes.donations import SDonationAdd, SDonationUpdate
+from app.services.base import BaseService
+
+EXPORT_COLUMNS = ("id", "project_id", "user_id", "amount", "created_at")
+
+
+def _as_naive_utc(value: datetime | None) -> datetime | None:
+    # created_at хранится в UTC без часового пояса
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _encode_ndjson(rows) -> bytes:
+    lines = []
+    for row in rows:
+        record = dict(row._mapping)
+        record["created_at"] = record["created_at"].isoformat()
+        lines.append(json.dumps(record, separators=(",", ":")))
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+def _encode_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        (row.id, row.project_id, row.user_id, row.amount, row.created_at.isoformat())
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+class DonationsService(BaseService):
+    async def get_filtered_donations(
+        self,
+        offset: int,
+        limit: int,
+        user_id: int | None = None,
+        project_id: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ):
+        return await self.db.donations.get_filtered(
+            offset=offset,
+            limit=limit,
+            user_id=user_id,
+            project_id=project_id,
+            fields=fields,
+        )
+
+    async def get_donations_page(
+        self,
+        limit: int,
+        cursor: str | None,
+        sort_key: str,
+        descending: bool,
+        user_id: int | None = None,
+        project_id: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ):
+        return await self.db.donations.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_key=sort_key,
+            descending=descending,
+            user_id=user_id,
+            project_id=project_id,
+            fields=fields,
+        )
+
+    @staticmethod
+    def check_export_period(
+        date_from: datetime | None, date_to: datetime | None
+    ) -> tuple[datetime | None, datetime | None]:
+        date_from, date_to = _as_naive_utc(date_from), _as_naive_utc(date_to)
+        if date_from is not None and date_to is not None and date_from >= date_to:
+            raise InvalidExportPeriodError
+        return date_from, date_to
+
+    async def export_donations(
+        self,
+        format: str,
+        compress: bool,
+        project_id: int | None = None,
+        user_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Выгрузка пожертвований в NDJSON или CSV кусками по пачкам строк,
+        при compress - со сжатием gzip на лету
+        """
+        encode = _encode_csv if format == "csv" else _encode_ndjson
+        compressor = zlib.compressobj(wbits=31) if compress else None
+
+        def output(chunk: bytes) -> bytes:
+            return compressor.compress(chunk) if compressor is not None else chunk
+
+        if format == "csv":
+            yield output((",".join(EXPORT_COLUMNS) + "\r\n").encode())
+        async for rows in self.db.donations.stream_export(
+            batch_size=settings.EXPORT_BATCH_SIZE,
+            project_id=project_id,
+            user_id=user_id,
+            date_from=date_from,
+            date_to=date_to,
+        ):
+            chunk = output(encode(rows))
+            if chunk:
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+
+    async def get_donation(self, donation_id: int, fields: tuple[str, ...] | None = None):
+        return await self.db.donations.get_one_or_none(fields=fields, id=donation_id)
+
+    async def create_donation(self, donation_data: SDonationAdd):
+        donation = await self.db.donations.add(donation_data)
+        await self.db.projects.add_to_collected(
+            project_id=donation.project_id, amount=donation.amount
+        )
+        await self.db.project_stats.apply_donations([donation])
+        await self.db.commit()
+
+        return donation
+
+    async def create_donations_bulk(self, donations_data: list[SDonationAdd]):
+        """Добавляет пачку пожертвований одной транзакцией"""
+        donations = await self.add_donations_bulk(donations_data)
+        await self.db.commit()
+
+        return donations
+
+    async def add_donations_bulk(self, donations_data: list[SDonationAdd]):
+        """Добавляет пачку пожертвований вместе со счётчиками проектов, без коммита"""
+        donations = await self.db.donations.add_bulk(donations_data)
+
+        totals: dict[int, int] = {}
+        for donation in donations:
+            totals[donation.project_id] = (
+                totals.get(donation.project_id, 0) + donation.amount
+            )
+        for project_id, amount in totals.items():
+            await self.db.projects.add_to_collected(project_id=project_id, amount=amount)
+        await self.db.project_stats.apply_donations(donations)
+
+        return donations
+
+    async def update_donation(self, donation_id: int, donation_data: SDonationUpdate):
+        old_donation = await self.db.donations.get_one_or_none(id=donation_id)
+        if old_donation is None:
+            return None
+
+        await self.db.donations.edit(donation_data, exclude_unset=True, id=donation_id)
+        donation = await self.db.donations.get_one_or_none(id=donation_id)
+
+        await self.db.projects.add_to_collected(
+            project_id=old_donation.project_id, amount=-old_donation.amount
+        )
+        await self.db.projects.add_to_collected(
+            project_id=donation.project_id, amount=donation.amount
+        )
+        await self.db.project_stats.revert_donation(old_donation)
+        await self.db.project_stats.apply_donations([donation])
+        await self.db.commit()
+
+        return donation
+
+    async def delete_donation(self, donation_id: int):
+        donation = await self.db.donations.get_one_or_none(id=donation_id)
+        if donation is None:
+            return None
+
+        await self.db.donations.delete(id=donation_id)
+        await self.db.projects.add_to_collected(
+            project_id=donation.project_id, amount=-donation.amount
+        )
+        await self.db.project_stats.revert_donation(donation)
+        await self.db.commit()
+
+        return donation
@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.exceptions.auth import PasswordHasherOverloadedError
+
+
+class PasswordHasher:
+    """
+    Хэширование паролей bcrypt в отдельном ограниченном пуле потоков.
+
+    bcrypt отпускает GIL, поэтому пул потоков не блокирует цикл событий.
+    Если в работе и в очереди уже max_workers + max_queue задач, новые
+    отклоняются сразу, а не копятся в очереди пула.
+    """
+
+    def __init__(self, rounds: int, max_workers: int, max_queue: int):
+        self.context = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds
+        )
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+        self.rejected = 0
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherOverloadedError
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._pending -= 1
+
+    async def hash(self, plain_password: str) -> str:
+        return await self._run(self.context.hash, plain_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Проверяет пароль. Вторым элементом возвращает новый хэш, если
+        сохранённый создан с другой стоимостью (BCRYPT_ROUNDS)
+        """
+        return await self._run(
+            self.context.verify_and_update, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "rounds": settings.BCRYPT_ROUNDS,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,114 @@
+import time
+
+from app.config import settings
+from app.database.database import async_read_session_maker
+from app.database.db_manager import DBManager
+from app.schemes.relations_users_roles import SUserGetWithRels
+from app.utils.cache import MISSING, TTLCache
+
+
+class PrincipalCache:
+    """
+    Разрешение токена доступа в пользователя и его роль.
+
+    Расшифрованные токены и пользователи с ролями кэшируются на короткий TTL.
+    Роль из подписанного токена используется без обращения к БД, если после
+    выдачи токена (iat) ни роли, ни сам пользователь не менялись через
+    invalidate_roles/invalidate_user.
+
+    Отметки об изменениях хранятся в памяти процесса. При нескольких воркерах
+    остальные процессы об изменении не знают: закэшированный пользователь
+    живёт у них до PRINCIPAL_CACHE_TTL, а роль из токена принимается до
+    истечения токена (ACCESS_TOKEN_EXPIRE_MINUTES).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.tokens = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.users = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation = 0
+        self._roles_changed_at = 0.0
+        self._users_changed_at: dict[int, float] = {}
+        self.fast_path = 0
+        self.slow_path = 0
+
+    def decode_token(self, token: str) -> dict:
+        payload = self.tokens.get(token)
+        if payload is MISSING:
+            # Локальный импорт: AuthService сам обращается к principal_cache
+            from app.services.auth import AuthService
+
+            payload = AuthService.decode_token(token)
+            ttl = self.tokens.ttl
+            if "exp" in payload:
+                # Истёкший токен не должен пережить в кэше свой exp
+                ttl = min(ttl, payload["exp"] - time.time())
+            self.tokens.set(token, payload, ttl=ttl)
+        return payload
+
+    def claims_are_fresh(self, payload: dict) -> bool:
+        issued_at = payload.get("iat")
+        if issued_at is None or "role" not in payload:
+            return False
+        changed_at = max(
+            self._roles_changed_at,
+            self._users_changed_at.get(payload["user_id"], 0.0),
+        )
+        return issued_at > changed_at
+
+    async def get_user(self, user_id: int) -> SUserGetWithRels | None:
+        user = self.users.get(user_id)
+        if user is MISSING:
+            generation = self._generation
+            async with DBManager(session_factory=async_read_session_maker) as db:
+                user = await db.users.get_one_or_none_with_role(id=user_id)
+            # Пока шёл запрос, пользователя или роли могли изменить
+            if generation == self._generation:
+                self.users.set(user_id, user)
+        return user
+
+    async def get_role_name(self, payload: dict) -> str | None:
+        """Имя роли владельца токена или None, если пользователя больше нет"""
+        if self.claims_are_fresh(payload):
+            self.fast_path += 1
+            return payload["role"]
+        self.slow_path += 1
+        user = await self.get_user(payload["user_id"])
+        if user is None:
+            return None
+        return user.role.name
+
+    def invalidate_roles(self) -> None:
+        self._roles_changed_at = time.time()
+        self._generation += 1
+        self.users.clear()
+
+    def invalidate_user(self, user_id: int) -> None:
+        now = time.time()
+        # Отметки старше срока жизни токена уже ни на что не влияют
+        expired_before = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        self._users_changed_at = {
+            key: changed_at
+            for key, changed_at in self._users_changed_at.items()
+            if changed_at > expired_before
+        }
+        self._users_changed_at[user_id] = now
+        self._generation += 1
+        self.users.pop(user_id)
+
+    def stats(self) -> dict:
+        return {
+            "tokens": len(self.tokens),
+            "users": len(self.users),
+            "ttl": self.tokens.ttl,
+            "token_hits": self.tokens.hits,
+            "token_misses": self.tokens.misses,
+            "user_hits": self.users.hits,
+            "user_misses": self.users.misses,
+            "fast_path": self.fast_path,
+            "slow_path": self.slow_path,
+        }
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_TTL
+)
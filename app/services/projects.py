@@ -2,18 +2,138 @@
 
 
 
-from app.schemes.projects import SProjectAdd
+from collections import defaultdict
+
+from pydantic import BaseModel
+
+from app.config import settings
+from app.schemes.projects import (
+    SProjectAdd,
+    SProjectGet,
+    SProjectStatsGet,
+)
+from app.schemes.users import SUserPublic
 from app.services.base import BaseService
+from app.services.deadline_sweeper import deadline_sweeper
+from app.utils.serialization import list_adapter
+
+# Связь include= -> поле проекта с внешним ключом, без которого её не собрать
+RELATION_KEYS = {"creator": "creator_id", "category": "category_id"}
 
 
 class ProjectsService(BaseService):
-    async def get_filtered_projects(self, offset: int, limit: int,user_id: int | None, category_id: int | None):
-        return await self.db.projects.get_filtered(offset=offset, limit=limit,user_id=user_id, category_id=category_id)
+    async def get_filtered_projects(self, offset: int, limit: int,user_id: int | None, category_id: int | None, fields: tuple[str, ...] | None = None):
+        return await self.db.projects.get_filtered(offset=offset, limit=limit,creator_id=user_id, category_id=category_id, fields=fields)
+
+    async def get_projects_page(
+        self,
+        limit: int,
+        cursor: str | None,
+        sort_key: str,
+        descending: bool,
+        user_id: int | None,
+        category_id: int | None,
+        fields: tuple[str, ...] | None = None,
+    ):
+        return await self.db.projects.get_page(
+            limit=limit,
+            cursor=cursor,
+            sort_key=sort_key,
+            descending=descending,
+            fields=fields,
+            creator_id=user_id,
+            category_id=category_id,
+        )
     
-    async def get_project(self,project_id: int):
-        return await self.db.projects.get_one_or_none(id=project_id)
+    async def get_projects_version(self, user_id: int | None, category_id: int | None):
+        return await self.db.projects.get_version(creator_id=user_id, category_id=category_id)
+
+    async def get_project_version(self, project_id: int):
+        return await self.db.projects.get_version(id=project_id)
+
+    async def search_projects(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None,
+        category_id: int | None,
+        is_active: bool | None,
+    ):
+        return await self.db.projects.search(
+            query=query,
+            limit=limit,
+            cursor=cursor,
+            category_id=category_id,
+            is_active=is_active,
+        )
+
+    async def get_project(self,project_id: int, fields: tuple[str, ...] | None = None):
+        return await self.db.projects.get_one_or_none(fields=fields, id=project_id)
+
+    async def get_project_stats(self, project_id: int):
+        stats = await self.db.projects.get_stats(project_id=project_id)
+        if stats is not None:
+            return stats
+        # Строки в project_stats нет, пока у проекта нет ни одного пожертвования
+        if await self.db.projects.get_one_or_none(id=project_id) is None:
+            return None
+        return SProjectStatsGet(project_id=project_id)
+
     async def create_project(self, project_data: SProjectAdd):
         project = await self.db.projects.add(project_data)
         await self.db.commit()
+        deadline_sweeper.schedule(project.date_end)
+
+        return project
+
+
+    @staticmethod
+    def fields_for_include(
+        fields: tuple[str, ...] | None, include: tuple[str, ...]
+    ) -> tuple[str, ...] | None:
+        """fields, дополненные внешними ключами связей из include"""
+        if fields is None:
+            return None
+        needed = set(fields) | {RELATION_KEYS[name] for name in include if name in RELATION_KEYS}
+        return tuple(name for name in SProjectGet.model_fields if name in needed)
+
+    async def include_relations(
+        self, projects: list[BaseModel], include: tuple[str, ...], schema: type[BaseModel]
+    ) -> list[BaseModel]:
+        """
+        Дополняет проекты связями из include и приводит к schema (см.
+        relations_schema): по одному пакетному запросу на связь, сколько бы
+        проектов ни было на странице. Для donations и rewards - не больше
+        PROJECT_INCLUDE_*_LIMIT последних записей на проект
+        """
+        if not include:
+            return projects
+        values = [dict(project) for project in projects]
+        project_ids = [project.id for project in projects]
 
-        return project
\ No newline at end of file
+        if "creator" in include:
+            users = await self.db.users.get_by_ids(
+                (value["creator_id"] for value in values), schema=SUserPublic
+            )
+            by_id = {user.id: user for user in users}
+            for value in values:
+                value["creator"] = by_id.get(value["creator_id"])
+        if "category" in include:
+            categories = await self.db.categories.get_by_ids(
+                value["category_id"] for value in values
+            )
+            by_id = {category.id: category for category in categories}
+            for value in values:
+                value["category"] = by_id.get(value["category_id"])
+        for name, limit in (
+            ("donations", settings.PROJECT_INCLUDE_DONATIONS_LIMIT),
+            ("rewards", settings.PROJECT_INCLUDE_REWARDS_LIMIT),
+        ):
+            if name not in include:
+                continue
+            grouped = defaultdict(list)
+            for item in await getattr(self.db, name).get_latest_by("project_id", project_ids, limit):
+                grouped[item.project_id].append(item)
+            for value in values:
+                value[name] = grouped[value["id"]]
+        return list_adapter(schema).validate_python(values)
@@ -0,0 +1,206 @@
+import asyncio
+import math
+import time
+from array import array
+from collections import deque
+
+from app.config import settings
+from app.exceptions.rate_limit import AdmissionRejectedError, RateLimitExceededError
+
+
+class TokenBuckets:
+    """
+    Таблица корзин жетонов фиксированного размера.
+
+    Ключ хэшируется в слот, состояние слота - два double в массивах (жетоны и
+    время последнего пополнения), так что память не растёт с числом клиентов,
+    а проверка - O(1). Жетоны пополняются лениво при обращении. Клиенты,
+    попавшие в один слот, делят корзину: лимит для них только строже.
+    """
+
+    def __init__(self, slots: int, rate: float, burst: int):
+        self.slots = slots
+        self.rate = rate
+        self.burst = burst
+        self.tokens = array("d", [float(burst)]) * slots
+        self.updated = array("d", [0.0]) * slots
+
+    def slot(self, key) -> int:
+        return hash(key) % self.slots
+
+    def wait(self, slot: int, now: float) -> float:
+        """Пополняет слот; 0, если жетон есть, иначе через сколько секунд появится"""
+        tokens = min(self.burst, self.tokens[slot] + (now - self.updated[slot]) * self.rate)
+        self.tokens[slot] = tokens
+        self.updated[slot] = now
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, slot: int) -> None:
+        self.tokens[slot] -= 1
+
+
+class RouteRateLimit:
+    """Корзина на клиента и общая корзина ручки; жетон берётся из обеих сразу"""
+
+    def __init__(
+        self,
+        client_rate: float,
+        client_burst: int,
+        route_rate: float,
+        route_burst: int,
+        slots: int,
+    ):
+        self.clients = TokenBuckets(slots, client_rate, client_burst)
+        self.route = TokenBuckets(1, route_rate, route_burst)
+        self.admitted = 0
+        self.rejected = 0
+
+    def check(self, client: str) -> None:
+        now = time.monotonic()
+        slot = self.clients.slot(client)
+        wait = max(self.clients.wait(slot, now), self.route.wait(0, now))
+        if wait:
+            self.rejected += 1
+            raise RateLimitExceededError(retry_after=max(1, math.ceil(wait)))
+        self.clients.take(slot)
+        self.route.take(0)
+        self.admitted += 1
+
+    def stats(self) -> dict:
+        return {
+            "client_rate": self.clients.rate,
+            "client_burst": self.clients.burst,
+            "route_rate": self.route.rate,
+            "route_burst": self.route.burst,
+            "route_tokens": round(self.route.tokens[0], 3),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionGate:
+    """
+    Ограничение одновременных запросов класса ручек.
+
+    Сверх limit ещё max_queue запросов ждут освобождения места не дольше
+    queue_timeout_ms; остальные отклоняются сразу, не занимая ни писателя
+    SQLite, ни пул bcrypt. Освободившееся место передаётся первому в очереди.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout_ms: int, retry_after: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        # Ожидания, снятые по таймауту, остаются здесь до ближайшего release
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+            self.admitted += 1
+            return
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejectedError(retry_after=self.retry_after)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise AdmissionRejectedError(retry_after=self.retry_after)
+        except asyncio.CancelledError:
+            # Место уже передали, а запрос отменён - отдаём его следующему
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            self.waiting -= 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Место переходит ожидающему, active не меняется
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class RateLimiter:
+    """
+    Защита ручек от всплесков: сначала корзины жетонов ручки (429), затем
+    ограничение одновременных запросов её класса (503). Оба ответа несут
+    Retry-After. Подключается зависимостью admission (app/api/dependencies.py)
+    """
+
+    def __init__(self, routes: dict[str, RouteRateLimit], gates: dict[str, AdmissionGate]):
+        self.routes = routes
+        self.gates = gates
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "routes": {name: limit.stats() for name, limit in self.routes.items()},
+            "gates": {name: gate.stats() for name, gate in self.gates.items()},
+        }
+
+
+rate_limiter = RateLimiter(
+    routes={
+        "login": RouteRateLimit(
+            client_rate=settings.RATE_LIMIT_LOGIN_CLIENT_RATE,
+            client_burst=settings.RATE_LIMIT_LOGIN_CLIENT_BURST,
+            route_rate=settings.RATE_LIMIT_LOGIN_ROUTE_RATE,
+            route_burst=settings.RATE_LIMIT_LOGIN_ROUTE_BURST,
+            slots=settings.RATE_LIMIT_CLIENT_SLOTS,
+        ),
+        "register": RouteRateLimit(
+            client_rate=settings.RATE_LIMIT_REGISTER_CLIENT_RATE,
+            client_burst=settings.RATE_LIMIT_REGISTER_CLIENT_BURST,
+            route_rate=settings.RATE_LIMIT_REGISTER_ROUTE_RATE,
+            route_burst=settings.RATE_LIMIT_REGISTER_ROUTE_BURST,
+            slots=settings.RATE_LIMIT_CLIENT_SLOTS,
+        ),
+        "donations": RouteRateLimit(
+            client_rate=settings.RATE_LIMIT_DONATIONS_CLIENT_RATE,
+            client_burst=settings.RATE_LIMIT_DONATIONS_CLIENT_BURST,
+            route_rate=settings.RATE_LIMIT_DONATIONS_ROUTE_RATE,
+            route_burst=settings.RATE_LIMIT_DONATIONS_ROUTE_BURST,
+            slots=settings.RATE_LIMIT_CLIENT_SLOTS,
+        ),
+    },
+    gates={
+        "auth": AdmissionGate(
+            limit=settings.ADMISSION_AUTH_CONCURRENCY,
+            max_queue=settings.ADMISSION_AUTH_MAX_QUEUE,
+            queue_timeout_ms=settings.ADMISSION_AUTH_QUEUE_TIMEOUT_MS,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        ),
+        "donations": AdmissionGate(
+            limit=settings.ADMISSION_DONATIONS_CONCURRENCY,
+            max_queue=settings.ADMISSION_DONATIONS_MAX_QUEUE,
+            queue_timeout_ms=settings.ADMISSION_DONATIONS_QUEUE_TIMEOUT_MS,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+        ),
+    },
+)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.exceptions.base import ObjectNotFoundError
+from app.exceptions.refunds import ProjectNotFailedError
+from app.schemes.refunds import SRefundCheckpointGet
+from app.services.base import BaseService
+
+
+class RefundsService(BaseService):
+    """
+    Возвраты пожертвований проектов, не собравших цель к date_end.
+
+    Пожертвования проекта обходятся по id пачками по chunk_size; пачка возвратов
+    и отметка прогресса (refund_checkpoints) пишутся одной транзакцией, поэтому
+    после падения обход продолжается с последней закоммиченной пачки. После
+    каждой пачки - пауза throttle_ratio * время транзакции (не меньше
+    REFUND_MIN_PAUSE_MS), чтобы писатель оставался свободен для живых запросов
+    """
+
+    async def get_failed_project_ids(self, now: int, after_id: int, limit: int) -> list[int]:
+        return await self.db.projects.get_failed_ids(now=now, after_id=after_id, limit=limit)
+
+    async def check_failed(self, project_id: int, now: int) -> None:
+        project = await self.db.projects.get_one_or_none(id=project_id)
+        await self.db.rollback()
+        if project is None:
+            raise ObjectNotFoundError
+        if project.date_end > now or project.collected_amount >= project.target_amount:
+            raise ProjectNotFailedError
+
+    async def refund_project(
+        self,
+        project_id: int,
+        chunk_size: int = settings.REFUND_CHUNK_SIZE,
+        throttle_ratio: float = settings.REFUND_THROTTLE_RATIO,
+    ) -> SRefundCheckpointGet:
+        checkpoint = await self.db.refund_checkpoints.get_one_or_none(project_id=project_id)
+        # Не держим транзакцию записи открытой между пачками
+        await self.db.rollback()
+        last_id = checkpoint.last_donation_id if checkpoint is not None else 0
+        min_pause = settings.REFUND_MIN_PAUSE_MS / 1000
+
+        while True:
+            started = time.perf_counter()
+            chunk_last_id, read, count, amount = await self.db.refunds.refund_chunk(
+                project_id=project_id, after_id=last_id, limit=chunk_size
+            )
+            completed = read < chunk_size
+            if chunk_last_id is not None:
+                last_id = chunk_last_id
+            await self.db.refund_checkpoints.advance(
+                project_id=project_id,
+                last_donation_id=last_id,
+                refunds_count=count,
+                refunds_amount=amount,
+                completed=completed,
+            )
+            await self.db.commit()
+            if completed:
+                break
+            await asyncio.sleep(max(min_pause, (time.perf_counter() - started) * throttle_ratio))
+
+        checkpoint = await self.db.refund_checkpoints.get_one_or_none(project_id=project_id)
+        await self.db.rollback()
+        return checkpoint
@@ -1,4 +1,4 @@
-from app.schemes.rewards import SRewardAdd
+from app.schemes.rewards import SRewardAdd, SRewardUpdate
 from app.services.base import BaseService
 
 
@@ -6,10 +6,38 @@ class RewardsService(BaseService):
     async def get_filtered_rewards(self, offset: int, limit: int,user_id: int | None = None, category_id: int | None = None):
         return await self.db.rewards.get_filtered(offset=offset, limit=limit,user_id=user_id, category_id=category_id)
     
+    async def get_rewards_page(self, limit: int, cursor: str | None):
+        return await self.db.rewards.get_page(limit=limit, cursor=cursor)
+
+    async def get_rewards_version(self):
+        return await self.db.rewards.get_version()
+
+    async def get_reward_version(self, reward_id: int):
+        return await self.db.rewards.get_version(id=reward_id)
+
     async def get_reward(self,reward_id: int):
         return await self.db.rewards.get_one_or_none(id=reward_id)
     async def create_reward(self, reward_data: SRewardAdd):
         reward = await self.db.rewards.add(reward_data)
         await self.db.commit()
 
-        return reward
\ No newline at end of file
+        return reward
+
+    async def update_reward(self, reward_id: int, reward_data: SRewardUpdate):
+        reward = await self.db.rewards.get_one_or_none(id=reward_id)
+        if reward is None:
+            return None
+        await self.db.rewards.edit(reward_data, exclude_unset=True, id=reward_id)
+        reward = await self.db.rewards.get_one_or_none(id=reward_id)
+        await self.db.commit()
+
+        return reward
+
+    async def delete_reward(self, reward_id: int):
+        reward = await self.db.rewards.get_one_or_none(id=reward_id)
+        if reward is None:
+            return None
+        await self.db.rewards.delete(id=reward_id)
+        await self.db.commit()
+
+        return reward
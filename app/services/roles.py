@@ -3,6 +3,7 @@ from app.exceptions.roles import RoleNotFoundError, RoleAlreadyExistsError
 from app.schemes.roles import SRoleAdd
 from app.schemes.relations_users_roles import SRoleGetWithRels
 from app.services.base import BaseService
+from app.services.principals import principal_cache
 
 
 class RoleService(BaseService):
@@ -26,8 +27,9 @@ class RoleService(BaseService):
         role: SRoleGetWithRels | None = await self.db.roles.get_one_or_none(id=role_id)
         if not role:
             raise RoleNotFoundError
-        await self.db.roles.edit(role_data)
+        await self.db.roles.edit(role_data, id=role_id)
         await self.db.commit()
+        principal_cache.invalidate_roles()
         return
 
     async def delete_role(self, role_id: int):
@@ -36,6 +38,7 @@ class RoleService(BaseService):
             raise RoleNotFoundError
         await self.db.roles.delete(id=role_id)
         await self.db.commit()
+        principal_cache.invalidate_roles()
         return
 
     async def get_roles(self):
@@ -0,0 +1,82 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+
+BULK_FORMATS = ("ndjson", "csv")
+
+# (номер записи с 1, запись или None, ошибка разбора или None)
+BulkRecord = tuple[int, dict | None, str | None]
+
+
+def resolve_format(content_type: str | None, format: str | None) -> str:
+    """Явный параметр format важнее Content-Type; по умолчанию NDJSON"""
+    if format is not None:
+        return format
+    if content_type and content_type.split(";")[0].strip() == "text/csv":
+        return "csv"
+    return "ndjson"
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Режет поток байтов UTF-8 на строки, не собирая его целиком в памяти"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRecord]:
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row, None, "Некорректный JSON"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Ожидается JSON-объект"
+            continue
+        yield row, record, None
+
+
+async def _iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[BulkRecord]:
+    row = 0
+    header = None
+    pending = ""
+    async for line in iter_lines(chunks):
+        pending = f"{pending}\n{line}" if pending else line
+        # Нечётное число кавычек - поле в кавычках продолжается на следующей строке
+        if pending.count('"') % 2:
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, "Число колонок не совпадает с заголовком"
+            continue
+        # Пустые ячейки не передаём: сработают значения по умолчанию схемы
+        yield row, {key: value for key, value in zip(header, values) if value != ""}, None
+    if pending:
+        yield row + 1, None, "Незакрытая кавычка в конце файла"
+
+
+def iter_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[BulkRecord]:
+    """Разбирает поток NDJSON или CSV (с заголовком) в записи по одной"""
+    if format == "csv":
+        return _iter_csv(chunks)
+    return _iter_ndjson(chunks)
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from app.config import settings
+
+MISSING = object()
+
+
+class TTLCache:
+    """Ограниченный по размеру LRU-кэш, записи которого живут не дольше ttl секунд"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=MISSING):
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class QueryCache:
+    """
+    Кэш результатов чтения репозиториев.
+
+    Ключ записи включает номер поколения таблицы. Любая запись в таблицу
+    увеличивает поколение, и старые записи кэша больше не находятся
+    (а затем вытесняются по LRU/TTL).
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] = self.generation(table) + 1
+
+    def get(self, table: str, generation: int, key: Hashable):
+        return self._entries.get((table, generation, key))
+
+    def set(self, table: str, generation: int, key: Hashable, value) -> None:
+        # Поколение запоминается до запроса в БД: если таблицу успели изменить,
+        # результат ляжет под устаревшим поколением и не будет отдан
+        if generation == self.generation(table):
+            self._entries.set((table, generation, key), value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        requests = self._entries.hits + self._entries.misses
+        return {
+            "enabled": settings.QUERY_CACHE_ENABLED,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "ttl": self._entries.ttl,
+            "hits": self._entries.hits,
+            "misses": self._entries.misses,
+            "hit_ratio": self._entries.hits / requests if requests else 0,
+            "generations": dict(self._generations),
+        }
+
+
+query_cache = QueryCache(
+    maxsize=settings.QUERY_CACHE_MAXSIZE, ttl=settings.QUERY_CACHE_TTL
+)
@@ -0,0 +1,54 @@
+from functools import cache
+
+from pydantic import BaseModel, create_model
+
+from app.exceptions.fields import InvalidFieldsError, InvalidIncludeError
+
+
+def parse_fields(schema: type[BaseModel], fields: str | None) -> tuple[str, ...] | None:
+    """
+    Разбирает параметр fields=a,b,c. Возвращает поля в порядке схемы,
+    id добавляется всегда; None - нужны все поля
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested or requested - schema.model_fields.keys():
+        raise InvalidFieldsError
+    requested.add("id")
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@cache
+def partial_schema(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """Схема только с указанными полями, создаётся один раз на набор полей"""
+    return create_model(
+        f"{schema.__name__}Partial",
+        **{name: (schema.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+def parse_include(relations: type[BaseModel], include: str | None) -> tuple[str, ...]:
+    """
+    Разбирает параметр include=a,b. Допустимы поля relations, которых нет в
+    родительской схеме; порядок - как в relations, пустой кортеж - без связей
+    """
+    if include is None:
+        return ()
+    own = relations.__base__.model_fields.keys()
+    requested = {name.strip() for name in include.split(",") if name.strip()}
+    if not requested or requested - (relations.model_fields.keys() - own):
+        raise InvalidIncludeError
+    return tuple(name for name in relations.model_fields if name in requested)
+
+
+@cache
+def relations_schema(
+    schema: type[BaseModel], relations: type[BaseModel], include: tuple[str, ...]
+) -> type[BaseModel]:
+    """Схема ответа schema (полная или частичная) с перечисленными связями из relations"""
+    return create_model(
+        f"{schema.__name__}With{''.join(name.title() for name in include)}",
+        __base__=schema,
+        **{name: (relations.model_fields[name].annotation, ...) for name in include},
+    )
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import String, literal
+
+from app.exceptions.pagination import InvalidCursorError
+
+# Верхняя граница limit у списочных ручек
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(sort_key: str, value, last_id: int) -> str:
+    """Упаковывает позицию (sort_key, id) последней строки в непрозрачный курсор"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps([sort_key, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, object, int]:
+    """Распаковывает курсор, выданный encode_cursor"""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_key, value, last_id = json.loads(payload)
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError from exc
+
+    if not isinstance(sort_key, str) or not isinstance(last_id, int):
+        raise InvalidCursorError
+    return sort_key, value, last_id
+
+
+def seek_value(value):
+    """
+    Значение курсора для сравнения в SQL. CURRENT_TIMESTAMP хранит дату строкой
+    без долей секунды, а SQLAlchemy передаёт datetime с микросекундами - такие
+    строки сравнивались бы неверно, поэтому передаём дату в формате хранения
+    """
+    if isinstance(value, datetime):
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return literal(value.strftime(fmt), String)
+    return value
@@ -0,0 +1,37 @@
+import html
+import re
+
+from app.exceptions.search import InvalidSearchQueryError
+
+_TERM_RE = re.compile(r"\w+")
+
+# Границы совпадений в snippet() - символы из области частного использования,
+# которых нет в разметке; заменяются на <mark> уже после экранирования текста
+SNIPPET_START = "\ue000"
+SNIPPET_END = "\ue001"
+
+
+def build_match_query(query: str) -> str:
+    """
+    Превращает пользовательскую строку в запрос FTS5 MATCH: все слова
+    обязательны, последнее ищется по префиксу (поиск по мере ввода).
+    Операторы и кавычки FTS5 из ввода не используются
+    """
+    terms = _TERM_RE.findall(query)
+    if not terms:
+        raise InvalidSearchQueryError
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def highlight_snippet(snippet: str) -> str:
+    """
+    Экранирует текст фрагмента (название и описание вводят пользователи)
+    и только затем выделяет совпадения тегом <mark>
+    """
+    return (
+        html.escape(snippet)
+        .replace(SNIPPET_START, "<mark>")
+        .replace(SNIPPET_END, "</mark>")
+    )
@@ -0,0 +1,32 @@
+from functools import cache
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@cache
+def list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter списка схемы, создаётся один раз на класс"""
+    return TypeAdapter(list[schema])
+
+
+def json_list_response(
+    schema: type[BaseModel], items: list, response: Response | None = None
+) -> Response:
+    """
+    Сериализует уже провалидированные схемы сразу в JSON-байты, минуя
+    повторную валидацию response_model. Заголовки, выставленные ручкой
+    во внедрённый response, переносятся в ответ
+    """
+    headers = None
+    if response is not None:
+        headers = {
+            key: value
+            for key, value in response.headers.items()
+            if key != "content-length"
+        }
+    return Response(
+        content=list_adapter(schema).dump_json(items),
+        media_type="application/json",
+        headers=headers,
+    )
@@ -1,7 +1,15 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from app.config import settings
+from app.middleware.metrics import MetricsMiddleware
+from app.services.deadline_sweeper import deadline_sweeper
+from app.services.donation_intake import donation_intake
+from app.services.passwords import password_hasher
+
 # Импорт веб-роутера (для HTML страниц)
 from app.api.web import router as web_router
 
@@ -14,16 +22,36 @@ from app.api.categories import router as categories_router  # новый фай
 
 from app.api.roles import router as roles_router
 from app.api.auth import router as auth_router
+from app.api.system import router as system_router
+from app.api.metrics import router as metrics_router
 
 # Раскомментировать если есть users.py:
 # from app.api.users import router as users_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Фоновые задачи приложения
+    if settings.DONATION_INTAKE_ENABLED:
+        await donation_intake.start()
+    if settings.DEADLINE_SWEEPER_ENABLED:
+        await deadline_sweeper.start()
+    yield
+    await deadline_sweeper.stop()
+    await donation_intake.stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title="Crowdfunding Platform",
     version="1.0.0",
-    description="Платформа для краудфандинговых проектов"
+    description="Платформа для краудфандинговых проектов",
+    lifespan=lifespan,
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Подключение статических файлов (CSS, JS, изображения)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -41,6 +69,8 @@ app.include_router(categories_router)  # новый роутер
 
 app.include_router(auth_router)
 app.include_router(roles_router)
+app.include_router(system_router)
+app.include_router(metrics_router)
 
 # Health check endpoint
 @app.get("/api/health")
@@ -17,6 +17,9 @@ from app.models.categories import CategoriesModel
 from app.models.project import ProjectModel
 from app.models.rewards import RewardModel
 from app.models.donations import DonationModel
+from app.models.project_stats import ProjectStatsModel
+from app.models.leases import LeaseModel
+from app.models.refunds import RefundCheckpointModel, RefundModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -36,6 +39,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Служебные таблицы FTS5 создаются миграцией вручную, autogenerate их не трогает
+FTS_TABLE_PREFIX = "projects_fts"
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith(FTS_TABLE_PREFIX):
+        return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -58,6 +71,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +81,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
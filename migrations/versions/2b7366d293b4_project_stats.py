@@ -0,0 +1,50 @@
+"""Project donation stats
+
+Revision ID: 2b7366d293b4
+Revises: e600b3ec6bb3
+Create Date: 2026-02-03 10:27:14.880163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7366d293b4'
+down_revision: Union[str, Sequence[str], None] = 'e600b3ec6bb3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('donations_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('donors_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_donation', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_donation_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+    # Проверка "новый ли донор" и пересчёт максимума при удалении пожертвования
+    op.create_index('ix_donations_project_id_user_id', 'donations', ['project_id', 'user_id'], unique=False)
+    op.create_index('ix_donations_project_id_amount', 'donations', ['project_id', 'amount'], unique=False)
+    op.execute(
+        "INSERT INTO project_stats (project_id, total_amount, donations_count, "
+        "donors_count, max_donation, last_donation_at) "
+        "SELECT project_id, SUM(amount), COUNT(*), COUNT(DISTINCT user_id), "
+        "MAX(amount), MAX(created_at) FROM donations GROUP BY project_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_donations_project_id_amount', table_name='donations')
+    op.drop_index('ix_donations_project_id_user_id', table_name='donations')
+    op.drop_table('project_stats')
@@ -0,0 +1,83 @@
+"""Integer funding amounts in minor units
+
+Revision ID: 4871bf3d0506
+Revises: 31178c3edd1f
+Create Date: 2026-01-19 11:42:07.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4871bf3d0506'
+down_revision: Union[str, Sequence[str], None] = '31178c3edd1f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PROJECT_COLUMNS = (
+    "id, creator_id, title, description, target_amount, collected_amount, "
+    "category_id, is_active, date_start, date_end, created_at, updated_at"
+)
+
+
+def _recreate_projects(amount_type: sa.types.TypeEngine, collected_default) -> None:
+    """
+    Пересоздаёт projects с новым типом сумм. Не через batch_alter_table: он
+    перебирает ограничения таблицы как множество, и порядок FOREIGN KEY в
+    CREATE TABLE менялся от запуска к запуску. Здесь порядок задан явно
+    """
+    op.create_table('_projects_new',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('creator_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=False),
+    sa.Column('target_amount', amount_type, nullable=False),
+    sa.Column('collected_amount', amount_type, server_default=collected_default, nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('date_start', sa.Integer(), nullable=False),
+    sa.Column('date_end', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+    sa.ForeignKeyConstraint(['creator_id'], ['users.id'], )
+    )
+    # Суммы приводятся к типу колонки по её affinity
+    op.execute(f"INSERT INTO _projects_new ({PROJECT_COLUMNS}) SELECT {PROJECT_COLUMNS} FROM projects")
+    op.drop_table('projects')
+    op.rename_table('_projects_new', 'projects')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Строковые суммы хранились в основных единицах ("1500.50"), переводим в копейки
+    op.execute(
+        "UPDATE projects SET target_amount = "
+        "CAST(ROUND(CAST(REPLACE(target_amount, ',', '.') AS REAL) * 100) AS INTEGER)"
+    )
+    _recreate_projects(sa.Integer(), sa.text('0'))
+    # Пожертвования уже целые, но в основных единицах - тоже переводим в копейки,
+    # иначе collected_amount несопоставим с target_amount
+    op.execute("UPDATE donations SET amount = amount * 100")
+    # Собранная сумма больше не вводится вручную, а считается по пожертвованиям
+    op.execute(
+        "UPDATE projects SET collected_amount = "
+        "(SELECT COALESCE(SUM(amount), 0) FROM donations "
+        "WHERE donations.project_id = projects.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_projects(sa.String(length=65535), None)
+    op.execute(
+        "UPDATE projects SET "
+        "target_amount = printf('%.2f', target_amount / 100.0), "
+        "collected_amount = printf('%.2f', collected_amount / 100.0)"
+    )
+    op.execute("UPDATE donations SET amount = CAST(ROUND(amount / 100.0) AS INTEGER)")
@@ -0,0 +1,58 @@
+"""Projects full-text search
+
+Revision ID: 9c41d2e7a8f0
+Revises: 2b7366d293b4
+Create Date: 2026-02-10 12:41:07.315204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d2e7a8f0'
+down_revision: Union[str, Sequence[str], None] = '2b7366d293b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Внешнее содержимое: индекс FTS5 хранит только токены, текст берётся из projects
+    op.execute(
+        "CREATE VIRTUAL TABLE projects_fts USING fts5("
+        "title, description, content='projects', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER projects_fts_ai AFTER INSERT ON projects BEGIN "
+        "INSERT INTO projects_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER projects_fts_ad AFTER DELETE ON projects BEGIN "
+        "INSERT INTO projects_fts(projects_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    )
+    # Только по изменению текста: обновления collected_amount индекс не трогают
+    op.execute(
+        "CREATE TRIGGER projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN "
+        "INSERT INTO projects_fts(projects_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO projects_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER projects_fts_au")
+    op.execute("DROP TRIGGER projects_fts_ad")
+    op.execute("DROP TRIGGER projects_fts_ai")
+    op.execute("DROP TABLE projects_fts")
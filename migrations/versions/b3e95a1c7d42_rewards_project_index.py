@@ -0,0 +1,29 @@
+"""Rewards project index
+
+Revision ID: b3e95a1c7d42
+Revises: 9c41d2e7a8f0
+Create Date: 2026-10-18 15:02:36.418920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e95a1c7d42'
+down_revision: Union[str, Sequence[str], None] = '9c41d2e7a8f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Награды проектов страницы для include=rewards (BaseRepository.get_latest_by)
+    op.create_index('ix_rewards_project_id_id', 'rewards', ['project_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rewards_project_id_id', table_name='rewards')
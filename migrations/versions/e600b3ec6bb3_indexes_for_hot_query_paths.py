@@ -0,0 +1,46 @@
+"""Indexes for hot query paths
+
+Revision ID: e600b3ec6bb3
+Revises: 4871bf3d0506
+Create Date: 2026-01-26 16:08:51.502917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e600b3ec6bb3'
+down_revision: Union[str, Sequence[str], None] = '4871bf3d0506'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Фильтры ProjectsService.get_filtered_projects + курсор по id
+    op.create_index('ix_projects_creator_id_id', 'projects', ['creator_id', 'id'], unique=False)
+    op.create_index('ix_projects_category_id_id', 'projects', ['category_id', 'id'], unique=False)
+    # Выборка живых/истёкших проектов и сортировка по дате окончания
+    op.create_index('ix_projects_is_active_date_end', 'projects', ['is_active', 'date_end'], unique=False)
+    op.create_index('ix_projects_date_end', 'projects', ['date_end'], unique=False)
+    # Списки пожертвований по проекту/пользователю + курсор по id
+    op.create_index('ix_donations_project_id_id', 'donations', ['project_id', 'id'], unique=False)
+    op.create_index('ix_donations_user_id_id', 'donations', ['user_id', 'id'], unique=False)
+    op.create_index('ix_donations_created_at', 'donations', ['created_at'], unique=False)
+    # selectinload пользователей роли (RolesRepository.get_one_or_none_with_users)
+    op.create_index('ix_users_role_id', 'users', ['role_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_role_id', table_name='users')
+    op.drop_index('ix_donations_created_at', table_name='donations')
+    op.drop_index('ix_donations_user_id_id', table_name='donations')
+    op.drop_index('ix_donations_project_id_id', table_name='donations')
+    op.drop_index('ix_projects_date_end', table_name='projects')
+    op.drop_index('ix_projects_is_active_date_end', table_name='projects')
+    op.drop_index('ix_projects_category_id_id', table_name='projects')
+    op.drop_index('ix_projects_creator_id_id', table_name='projects')
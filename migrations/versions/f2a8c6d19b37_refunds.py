@@ -0,0 +1,55 @@
+"""Refunds for failed projects
+
+Revision ID: f2a8c6d19b37
+Revises: d41f7c9a2e65
+Create Date: 2026-10-18 16:20:45.117032
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c6d19b37'
+down_revision: Union[str, Sequence[str], None] = 'd41f7c9a2e65'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('refunds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('donation_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['donation_id'], ['donations.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('donation_id')
+    )
+    op.create_index('ix_refunds_project_id', 'refunds', ['project_id'], unique=False)
+    op.create_table('refund_checkpoints',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('last_donation_id', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('refunds_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('refunds_amount', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('refund_checkpoints')
+    op.drop_index('ix_refunds_project_id', table_name='refunds')
+    op.drop_table('refunds')
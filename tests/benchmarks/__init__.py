@@ -0,0 +1,6 @@
+"""
+Нагрузочные замеры приложения в одном процессе: main.app через ASGI-транспорт
+httpx на временной БД с данными нужного масштаба.
+
+Запуск: python -m tests.benchmarks --help
+"""
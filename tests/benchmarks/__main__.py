@@ -0,0 +1,151 @@
+"""
+Запуск: python -m tests.benchmarks [--scales small,medium] [--concurrency 1,8,32]
+    [--requests 200] [--only projects,donations] [--seed 0] [--output results.json]
+    [--baseline previous.json --tolerance 0.2]
+
+С --baseline сравнивает отслеживаемые сценарии с прошлым прогоном и
+завершается с кодом 1, если p95, req/s или число SQL-запросов на запрос
+ухудшились больше чем на tolerance.
+"""
+# tests.conftest задаёт окружение и временную БД до импорта приложения
+from tests.conftest import ROOT_DIR, run_async
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+
+import httpx
+
+from app.jobs.generate_data import create_database
+from tests.benchmarks.runner import compare, install_sql_counter, run_scenario
+from tests.benchmarks.scenarios import SCENARIOS
+
+# Масштаб -> scale factor генератора app/jobs/generate_data.py
+SCALES = {"small": 0.005, "medium": 0.05, "large": 0.5}
+
+
+def prepare_database(scale: str, seed: int) -> dict[str, int]:
+    """Пересоздаёт временную БД генератором с данными масштаба scale"""
+    from app.services.principals import principal_cache
+    from app.utils.cache import query_cache
+
+    db_path = os.environ["DB_NAME"]
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    counts = create_database(db_path, scale_factor=SCALES[scale], seed=seed)
+    query_cache.clear()
+    principal_cache.tokens.clear()
+    principal_cache.invalidate_roles()
+    return counts
+
+
+async def run_scale(scale, counts, scenarios, concurrency_levels, requests) -> list[dict]:
+    from app.services.auth import AuthService
+    from main import app
+
+    install_sql_counter()
+    token = AuthService.create_access_token({"user_id": 1, "role": "admin"})
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    async with (
+        httpx.AsyncClient(transport=transport, base_url="http://benchmark") as anonymous,
+        httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", cookies={"access_token": token}
+        ) as admin,
+    ):
+        for scenario in scenarios:
+            for concurrency in concurrency_levels:
+                client = admin if scenario.auth else anonymous
+                result = {"scale": scale} | await run_scenario(
+                    client, scenario, counts, requests, concurrency
+                )
+                results.append(result)
+                print(
+                    f"{scale:<7} {scenario.name:<28} c={concurrency:<3} "
+                    f"p50={result['p50_ms']:>8.2f}ms p95={result['p95_ms']:>8.2f}ms "
+                    f"p99={result['p99_ms']:>8.2f}ms {result['rps']:>8.1f} req/s "
+                    f"sql={result['sql_per_request']:<5} errors={result['errors']}",
+                    flush=True,
+                )
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _split(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры API в одном процессе через ASGI")
+    parser.add_argument("--scales", type=_split, default=["small", "medium"])
+    parser.add_argument("--concurrency", type=lambda v: [int(i) for i in _split(v)], default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--only", type=_split, default=None, help="роутеры или имена сценариев")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=None, help="JSON прошлого прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    unknown = set(args.scales) - SCALES.keys()
+    if unknown:
+        parser.error(f"неизвестные масштабы: {', '.join(sorted(unknown))}")
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if args.only is None or scenario.router in args.only or scenario.name in args.only
+    ]
+
+    results = []
+    for scale in args.scales:
+        counts = prepare_database(scale, args.seed)
+        results += run_async(
+            run_scale(scale, counts, scenarios, args.concurrency, args.requests)
+        )
+
+    from app.services.passwords import password_hasher
+
+    password_hasher.shutdown()
+    report = {
+        "meta": {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "seed": args.seed,
+            "scales": {scale: SCALES[scale] for scale in args.scales},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f"Результаты: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"Регрессий нет (допуск {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import statistics
+import time
+
+import httpx
+from sqlalchemy import event
+
+from tests.benchmarks.scenarios import Scenario
+
+# Счётчик SQL-запросов текущего HTTP-запроса; список, чтобы его видели и
+# копии контекста внутри приложения (задачи anyio, потоковые ответы)
+sql_statements: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "sql_statements", default=None
+)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = sql_statements.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_sql_counter() -> None:
+    from app.database.database import engine, engine_null_pool, read_engine
+
+    for async_engine in (engine, read_engine, engine_null_pool):
+        if not event.contains(async_engine.sync_engine, "before_cursor_execute", _count_statement):
+            event.listen(async_engine.sync_engine, "before_cursor_execute", _count_statement)
+
+
+def percentile(quantiles: list[float], p: int) -> float:
+    return quantiles[p - 1]
+
+
+async def _send(client: httpx.AsyncClient, request) -> tuple[float, int, bool]:
+    method, path, kwargs = request
+    counter = [0]
+    token = sql_statements.set(counter)
+    try:
+        started = time.perf_counter()
+        response = await client.request(method, path, **kwargs)
+        elapsed = time.perf_counter() - started
+    finally:
+        sql_statements.reset(token)
+    return elapsed, counter[0], response.status_code >= 400
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    counts: dict[str, int],
+    requests: int,
+    concurrency: int,
+    warmup: int = 5,
+) -> dict:
+    """Выполняет requests запросов сценария в concurrency параллельных потоков"""
+    requests = scenario.requests or requests
+    for i in range(min(warmup, requests)):
+        await _send(client, scenario.build(i, counts))
+
+    latencies: list[float] = []
+    statements: list[int] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            elapsed, count, failed = await _send(client, scenario.build(warmup + i, counts))
+            latencies.append(elapsed)
+            statements.append(count)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    wall = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "scenario": scenario.name,
+        "router": scenario.router,
+        "tracked": scenario.tracked,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(quantiles, 50) * 1000, 3),
+        "p95_ms": round(percentile(quantiles, 95) * 1000, 3),
+        "p99_ms": round(percentile(quantiles, 99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+        "rps": round(requests / wall, 1),
+        "sql_per_request": round(statistics.fmean(statements), 2),
+    }
+
+
+# Метрика -> True, если больше значит хуже
+COMPARED_METRICS = {"p95_ms": True, "rps": False, "sql_per_request": True}
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Регрессии отслеживаемых сценариев относительно эталонного прогона"""
+    def key(result: dict) -> tuple:
+        return result["scale"], result["scenario"], result["concurrency"]
+
+    reference = {key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get(key(result))
+        if base is None or not result["tracked"]:
+            continue
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{'/'.join(map(str, key(result)))}: errors {base['errors']} -> {result['errors']}")
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            old, new = base[metric], result[metric]
+            limit = old * (1 + tolerance) if higher_is_worse else old * (1 - tolerance)
+            if (new > limit) if higher_is_worse else (new < limit):
+                regressions.append(
+                    f"{'/'.join(map(str, key(result)))}: {metric} {old} -> {new}"
+                )
+    return regressions
@@ -0,0 +1,123 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.jobs.generate_data import ADMIN_EMAIL, password_for
+
+# (метод, путь, аргументы httpx) для i-го запроса сценария при объёмах counts
+Request = tuple[str, str, dict]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    router: str
+    build: Callable[[int, dict[str, int]], Request]
+    # Запрос от имени администратора (cookie access_token)
+    auth: bool = False
+    # Участвует в сравнении с эталоном (--baseline)
+    tracked: bool = True
+    # Своё число запросов для дорогих сценариев (bcrypt), иначе --requests
+    requests: int | None = None
+
+
+def _pick(i: int, total: int) -> int:
+    """Детерминированный разброс идентификаторов по всей таблице"""
+    return i * 7919 % total + 1
+
+
+def _get(path: str, **params) -> Request:
+    return "GET", path, {"params": params} if params else {}
+
+
+SCENARIOS: list[Scenario] = [
+    # projects
+    Scenario("projects.list", "projects", lambda i, c: _get("/api/projects/", limit=20)),
+    Scenario(
+        "projects.list_by_category",
+        "projects",
+        lambda i, c: _get("/api/projects/", limit=20, category_id=_pick(i, c["categories"])),
+    ),
+    Scenario(
+        "projects.list_fields",
+        "projects",
+        lambda i, c: _get("/api/projects/", limit=50, fields="title,collected_amount"),
+    ),
+    Scenario(
+        "projects.list_include",
+        "projects",
+        lambda i, c: _get("/api/projects/", limit=100, include="creator,category,donations,rewards"),
+    ),
+    Scenario(
+        "projects.get", "projects", lambda i, c: _get(f"/api/projects/{_pick(i, c['projects'])}")
+    ),
+    Scenario(
+        "projects.stats",
+        "projects",
+        lambda i, c: _get(f"/api/projects/{_pick(i, c['projects'])}/stats"),
+    ),
+    Scenario(
+        "projects.search",
+        "projects",
+        lambda i, c: _get("/api/projects/search", q=("игра", "музыка", "робот", "сад")[i % 4]),
+    ),
+    # donations
+    Scenario("donations.list", "donations", lambda i, c: _get("/api/donations/", limit=20)),
+    Scenario(
+        "donations.list_by_project",
+        "donations",
+        lambda i, c: _get("/api/donations/", limit=20, project_id=_pick(i, c["projects"])),
+    ),
+    Scenario(
+        "donations.get",
+        "donations",
+        lambda i, c: _get(f"/api/donations/{_pick(i, c['donations'])}"),
+    ),
+    Scenario(
+        "donations.export_project",
+        "donations",
+        lambda i, c: _get("/api/donations/export", project_id=_pick(i, c["projects"])),
+    ),
+    Scenario(
+        "donations.create",
+        "donations",
+        lambda i, c: (
+            "POST",
+            "/api/donations/",
+            {
+                "json": {
+                    "project_id": _pick(i, c["projects"]),
+                    "user_id": _pick(i, c["users"]),
+                    "amount": 100,
+                }
+            },
+        ),
+    ),
+    # rewards
+    Scenario("rewards.list", "rewards", lambda i, c: _get("/api/rewards/", limit=20)),
+    Scenario("rewards.get", "rewards", lambda i, c: _get(f"/api/rewards/{_pick(i, c['rewards'])}")),
+    # categories
+    Scenario("categories.list", "categories", lambda i, c: _get("/api/categories/")),
+    Scenario(
+        "categories.get",
+        "categories",
+        lambda i, c: _get(f"/api/categories/{_pick(i, c['categories'])}"),
+    ),
+    # roles
+    Scenario("roles.list", "roles", lambda i, c: _get("/auth/roles"), auth=True),
+    Scenario("roles.get", "roles", lambda i, c: _get(f"/auth/roles/{i % 2 + 1}"), auth=True),
+    # auth
+    Scenario("auth.me", "auth", lambda i, c: _get("/auth/me"), auth=True),
+    Scenario(
+        "auth.login",
+        "auth",
+        lambda i, c: (
+            "POST",
+            "/auth/login",
+            {"json": {"email": ADMIN_EMAIL, "password": password_for(1)}},
+        ),
+        requests=20,
+    ),
+    # web
+    Scenario("web.index", "web", lambda i, c: _get("/")),
+    Scenario("web.projects", "web", lambda i, c: _get("/projects")),
+]
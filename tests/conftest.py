@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+# app.config читает настройки при импорте, поэтому окружение задаётся до импорта приложения
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+# Все клиенты тестов и бенчмарков приходят с одного адреса - лимиты их бы отсекали
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ["DB_NAME"] = os.path.join(tempfile.mkdtemp(prefix="crowdfunding-tests-"), "test.db")
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_async(coro):
+    """Запускает корутину в новом цикле событий и закрывает пулы движков после неё"""
+    from app.database.database import engine, engine_null_pool, read_engine
+
+    async def runner():
+        try:
+            return await coro
+        finally:
+            for async_engine in (engine, read_engine, engine_null_pool):
+                await async_engine.dispose()
+
+    return asyncio.run(runner())
+
+
+@pytest.fixture(scope="session")
+def db_path() -> str:
+    """Путь к временной БД, созданной миграциями alembic"""
+    command.upgrade(Config(str(ROOT_DIR / "alembic.ini")), "head")
+    return os.environ["DB_NAME"]
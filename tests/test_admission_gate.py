@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from app.exceptions.rate_limit import AdmissionRejectedError
+from app.services.rate_limiter import AdmissionGate
+
+
+def make_gate(limit: int = 1, max_queue: int = 2, queue_timeout_ms: int = 1000) -> AdmissionGate:
+    return AdmissionGate(
+        limit=limit, max_queue=max_queue, queue_timeout_ms=queue_timeout_ms, retry_after=1
+    )
+
+
+async def queued(gate: AdmissionGate) -> asyncio.Task:
+    """Запускает acquire и ждёт, пока запрос встанет в очередь"""
+    task = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+    assert not task.done()
+    return task
+
+
+def test_admits_up_to_limit_without_queue():
+    async def scenario():
+        gate = make_gate(limit=2)
+        await gate.acquire()
+        await gate.acquire()
+        assert (gate.active, gate.waiting, gate.admitted) == (2, 0, 2)
+        gate.release()
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_slot_to_first_waiter():
+    async def scenario():
+        gate = make_gate()
+        await gate.acquire()
+        first = await queued(gate)
+        second = await queued(gate)
+        assert gate.waiting == 2
+
+        gate.release()
+        await first
+        # Место перешло ожидающему, а не освободилось
+        assert (gate.active, gate.waiting) == (1, 1)
+        assert not second.done()
+
+        gate.release()
+        await second
+        gate.release()
+        assert (gate.active, gate.waiting, gate.admitted) == (0, 0, 3)
+
+    asyncio.run(scenario())
+
+
+def test_rejects_when_queue_is_full():
+    async def scenario():
+        gate = make_gate(max_queue=1)
+        await gate.acquire()
+        waiter = await queued(gate)
+
+        with pytest.raises(AdmissionRejectedError):
+            await gate.acquire()
+        assert (gate.rejected, gate.waiting) == (1, 1)
+
+        gate.release()
+        await waiter
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_rejects_and_keeps_slot_count():
+    async def scenario():
+        gate = make_gate(queue_timeout_ms=10)
+        await gate.acquire()
+
+        with pytest.raises(AdmissionRejectedError):
+            await gate.acquire()
+        assert (gate.timed_out, gate.waiting) == (1, 0)
+
+        # Снятое по таймауту ожидание пропускается, место освобождается
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_take_slot():
+    async def scenario():
+        gate = make_gate()
+        await gate.acquire()
+        cancelled = await queued(gate)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert gate.waiting == 0
+
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancel_after_handoff_passes_slot_on():
+    async def scenario():
+        gate = make_gate()
+        await gate.acquire()
+        cancelled = await queued(gate)
+        next_waiter = await queued(gate)
+
+        # Место уже передано, но запрос отменили раньше, чем он его забрал
+        gate.release()
+        cancelled.cancel()
+        (result,) = await asyncio.gather(cancelled, return_exceptions=True)
+        if not isinstance(result, asyncio.CancelledError):
+            # wait_for в Python 3.11 отдаёт результат, если он готов к моменту отмены:
+            # запрос допущен и сам освобождает место
+            gate.release()
+
+        await next_waiter
+        assert (gate.active, gate.waiting) == (1, 0)
+        gate.release()
+        assert gate.active == 0
+
+    asyncio.run(scenario())
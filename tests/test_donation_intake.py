@@ -0,0 +1,100 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from tests.conftest import run_async
+
+PROJECT_IDS = (101, 102)
+
+
+@pytest.fixture
+def intake_db(db_path):
+    """Проекты для пожертвований и триггер, отклоняющий отрицательные суммы"""
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.executemany(
+            "INSERT INTO projects (id, creator_id, title, description, target_amount, "
+            "collected_amount, category_id, is_active, date_start, date_end) "
+            "VALUES (?, 1, 'Сбор', 'Описание', 10000, 0, 1, 1, 0, 100)",
+            [(project_id,) for project_id in PROJECT_IDS],
+        )
+        connection.execute(
+            "CREATE TRIGGER test_reject_negative_amount BEFORE INSERT ON donations "
+            "WHEN NEW.amount < 0 BEGIN SELECT RAISE(ABORT, 'negative amount'); END"
+        )
+    yield connection
+    with connection:
+        connection.execute("DROP TRIGGER test_reject_negative_amount")
+        for table in ("donations", "project_stats"):
+            connection.execute(
+                f"DELETE FROM {table} WHERE project_id IN (?, ?)", PROJECT_IDS
+            )
+        connection.execute("DELETE FROM projects WHERE id IN (?, ?)", PROJECT_IDS)
+    connection.close()
+
+
+def submit_all(amounts: list[tuple[int, int]]):
+    """Отправляет пожертвования одновременно, чтобы они попали в одну пачку"""
+    from app.database.database import async_session_maker
+    from app.schemes.donations import SDonationAdd
+    from app.services.donation_intake import DonationIntake
+
+    intake = DonationIntake(
+        session_factory=async_session_maker, batch_size=100, max_delay_ms=50, max_queue=100
+    )
+
+    async def scenario():
+        await intake.start()
+        try:
+            return await asyncio.gather(
+                *(
+                    intake.submit(SDonationAdd(project_id=project_id, user_id=1, amount=amount))
+                    for project_id, amount in amounts
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            await intake.stop()
+
+    return intake, run_async(scenario())
+
+
+def collected(connection) -> dict[int, int]:
+    return dict(
+        connection.execute(
+            "SELECT id, collected_amount FROM projects WHERE id IN (?, ?)", PROJECT_IDS
+        ).fetchall()
+    )
+
+
+def test_batch_resolves_each_caller_with_own_row(intake_db):
+    amounts = [(101, 100), (102, 200), (101, 300)]
+    intake, results = submit_all(amounts)
+
+    assert intake.batches == 1
+    assert intake.failed_batches == 0
+    assert [(row.project_id, row.amount) for row in results] == amounts
+    assert len({row.id for row in results}) == len(amounts)
+    assert collected(intake_db) == {101: 400, 102: 200}
+
+
+def test_failed_batch_retries_rows_one_by_one(intake_db):
+    from app.exceptions.base import ObjectAlreadyExistsError
+
+    amounts = [(101, 100), (102, -1), (101, 300)]
+    intake, results = submit_all(amounts)
+
+    assert intake.batches == 1
+    assert intake.failed_batches == 1
+    first, failed, last = results
+    assert isinstance(failed, ObjectAlreadyExistsError)
+    assert (first.project_id, first.amount) == (101, 100)
+    assert (last.project_id, last.amount) == (101, 300)
+    assert first.id < last.id
+    # Откатилась только строка с ошибкой, остальные записаны вместе со счётчиками
+    stored = intake_db.execute(
+        "SELECT id, amount FROM donations WHERE project_id IN (?, ?) ORDER BY id", PROJECT_IDS
+    ).fetchall()
+    assert stored == [(first.id, 100), (last.id, 300)]
+    assert collected(intake_db) == {101: 400, 102: 0}
@@ -0,0 +1,194 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from tests.conftest import run_async
+
+SEED_SQL = [
+    "INSERT INTO roles (id, name) VALUES (1, 'user'), (2, 'admin')",
+    "INSERT INTO users (id, name, email, hashed_password, role_id) VALUES "
+    "(1, 'Первый', 'first@example.com', 'hash', 1), "
+    "(2, 'Второй', 'second@example.com', 'hash', 2)",
+    "INSERT INTO categories (id, name) VALUES (1, 'Игры'), (2, 'Музыка')",
+    "INSERT INTO projects (id, creator_id, title, description, target_amount, "
+    "collected_amount, category_id, is_active, date_start, date_end) VALUES "
+    "(1, 1, 'Первый', 'Описание', 10000, 0, 1, 1, 0, 100), "
+    "(2, 1, 'Второй', 'Описание', 10000, 0, 1, 1, 0, 100), "
+    "(3, 2, 'Третий', 'Описание', 10000, 0, 2, 0, 0, 50)",
+    "INSERT INTO donations (project_id, user_id, amount) VALUES "
+    "(1, 1, 100), (1, 2, 200), (2, 1, 300), (2, 2, 400)",
+]
+
+
+@pytest.fixture(scope="module")
+def seeded_db(db_path):
+    connection = sqlite3.connect(db_path)
+    with connection:
+        for statement in SEED_SQL:
+            connection.execute(statement)
+    connection.close()
+    return db_path
+
+
+async def projects_filters(db):
+    await db.projects.get_filtered(limit=10, offset=10, creator_id=1)
+    await db.projects.get_filtered(limit=10, offset=0, category_id=1)
+    await db.projects.get_one_or_none(id=1)
+    await db.projects.get_version(creator_id=1)
+    await db.projects.get_version(category_id=1)
+    await db.projects.get_version(id=1)
+
+
+async def projects_keyset(db):
+    for sort_key in db.projects.sort_keys:
+        for descending in (False, True):
+            for filter_by in ({}, {"creator_id": 1}, {"category_id": 1}):
+                _, cursor = await db.projects.get_page(
+                    limit=1, sort_key=sort_key, descending=descending, **filter_by
+                )
+                await db.projects.get_page(
+                    limit=1,
+                    cursor=cursor,
+                    sort_key=sort_key,
+                    descending=descending,
+                    **filter_by,
+                )
+
+
+async def donations_keyset(db):
+    for sort_key in db.donations.sort_keys:
+        for descending in (False, True):
+            for filter_by in ({}, {"project_id": 1}, {"user_id": 1}):
+                _, cursor = await db.donations.get_page(
+                    limit=1, sort_key=sort_key, descending=descending, **filter_by
+                )
+                await db.donations.get_page(
+                    limit=1,
+                    cursor=cursor,
+                    sort_key=sort_key,
+                    descending=descending,
+                    **filter_by,
+                )
+
+
+async def donations_export(db):
+    for filters in (
+        {"project_id": 1},
+        {"user_id": 1},
+        {"date_from": datetime(2020, 1, 1), "date_to": datetime(2030, 1, 1)},
+    ):
+        async for _ in db.donations.stream_export(batch_size=2, **filters):
+            pass
+
+
+async def funding_counters(db):
+    await db.projects.add_to_collected(project_id=1, amount=100)
+    await db.projects.reconcile_collected(after_id=0, limit=10)
+
+
+async def project_stats(db):
+    donations = await db.donations.get_filtered(project_id=1)
+    await db.project_stats.apply_donations(donations)
+    await db.project_stats.revert_donation(donations[0])
+    await db.projects.get_stats(project_id=1)
+    await db.project_stats.rebuild(after_id=0, limit=10)
+
+
+async def projects_search(db):
+    _, cursor = await db.projects.search(query="Второй", limit=1)
+    await db.projects.search(query="Описа", limit=1, cursor=cursor)
+    await db.projects.search(query="Описание", limit=10, category_id=1, is_active=True)
+
+
+async def project_relations(db):
+    projects = await db.projects.get_filtered(limit=10, offset=0)
+    await db.users.get_by_ids(project.creator_id for project in projects)
+    await db.categories.get_by_ids(project.category_id for project in projects)
+    await db.donations.get_latest_by("project_id", [1, 2, 3], limit=1)
+    await db.rewards.get_latest_by("project_id", [1, 2, 3], limit=1)
+
+
+async def project_deadlines(db):
+    await db.projects.get_upcoming_deadlines(after=60, limit=10)
+    await db.projects.deactivate_expired(now=60, limit=10)
+    await db.leases.acquire("sweeper", "worker", now=0, ttl=30)
+    await db.leases.release("sweeper", "worker")
+
+
+async def refunds(db):
+    await db.projects.get_failed_ids(now=60, after_id=0, limit=10)
+    await db.refunds.refund_chunk(project_id=1, after_id=0, limit=10)
+    await db.refund_checkpoints.advance(
+        project_id=1, last_donation_id=10, refunds_count=1, refunds_amount=100, completed=False
+    )
+    await db.refund_checkpoints.get_one_or_none(project_id=1)
+
+
+async def users_and_roles(db):
+    await db.users.get_one_or_none_with_role(email="first@example.com")
+    await db.users.get_one_or_none_with_role(id=1)
+    await db.roles.get_one_or_none_with_users(id=1)
+
+
+SCENARIOS = [
+    projects_filters,
+    projects_keyset,
+    donations_keyset,
+    donations_export,
+    funding_counters,
+    project_stats,
+    projects_search,
+    project_relations,
+    project_deadlines,
+    refunds,
+    users_and_roles,
+]
+
+
+def capture_statements(scenario) -> list[tuple[str, tuple]]:
+    """Выполняет сценарий через репозитории и возвращает все выполненные запросы"""
+    from app.database.database import async_session_maker, engine
+    from app.database.db_manager import DBManager
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async def run_scenario():
+        async with DBManager(session_factory=async_session_maker) as db:
+            await scenario(db)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        run_async(run_scenario())
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.__name__)
+def test_repository_queries_use_indexes(seeded_db, scenario):
+    statements = capture_statements(scenario)
+    assert statements
+
+    connection = sqlite3.connect(seeded_db)
+    try:
+        for statement, parameters in statements:
+            # Запросы без WHERE (первая страница без фильтров) читают таблицу по порядку
+            if "WHERE" not in statement:
+                continue
+            plan = connection.execute(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            ).fetchall()
+            # Обход виртуальной таблицы FTS5 по её индексу (MATCH) - не полный скан
+            scans = [
+                row[3]
+                for row in plan
+                if row[3].startswith("SCAN ") and "VIRTUAL TABLE INDEX" not in row[3]
+            ]
+            assert not scans, f"{statement}\n{parameters}\n{scans}"
+    finally:
+        connection.close()